@@ -0,0 +1,264 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import cached_property
+from types import SimpleNamespace
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BENCHMARKS_DIR, "history.jsonl")
+UNIVERSE_FILE = os.path.join(BENCHMARKS_DIR, '..', 'sp500', 'data.csv')
+
+# Anything an extractor writes to its cache while replaying goes to a throwaway directory
+os.environ["DATA_EXTRACTOR_CACHE_DIR"] = tempfile.mkdtemp(prefix="benchmark-cache-")
+sys.path.append(os.path.abspath(os.path.join(BENCHMARKS_DIR, '..', 'stocks')))
+sys.path.append(os.path.abspath(os.path.join(BENCHMARKS_DIR, '..', 'sp500')))
+
+from recordFixtures import HTML_DIR, load_ticker_fixture, recorded_symbols, frame_from_json, series_from_json
+from rateLimiter import DEFAULT_RATE_LIMITS, configure_rate_limit
+from stockSnapshot import StockSnapshot
+from getCostOfEquity import RISK_FREE_RATE, EXPECTED_MARKET_RETURN
+from macroInputs import parse_percentage
+import getEpsData
+import getPeRatioData
+import getAaaCorporateBondYield
+import getTopStock
+import getBenjaminGrahamList
+from getDCFValue import get_dcf_inputs, compute_dcf_value
+from getDDMValue import get_ddm_inputs, compute_ddm_value
+from getBenjaminGrahamValue import get_benjamin_graham_inputs, compute_benjamin_graham_value
+from getDCFSensitivity import get_dcf_sensitivity
+from getBetaValue import get_beta_value
+from getOpeningPrice import get_opening_price
+from valuationEngine import build_input_arrays, value_universe, valuation_documents
+
+class RecordedTicker:
+    # Stands in for yf.Ticker; frames are decoded once per fixture and shared, since the extractors only read them
+    def __init__(self, recorded):
+        self.recorded = recorded
+
+    @cached_property
+    def info(self):
+        return dict(self.recorded["info"])
+
+    @cached_property
+    def cashflow(self):
+        return frame_from_json(self.recorded["cashflow"])
+
+    @cached_property
+    def financials(self):
+        return frame_from_json(self.recorded["financials"])
+
+    @cached_property
+    def growth_estimates(self):
+        return frame_from_json(self.recorded["growth_estimates"])
+
+    @cached_property
+    def dividends(self):
+        return series_from_json(self.recorded["dividends"])
+
+class RecordedSnapshot(StockSnapshot):
+    def __init__(self, stock_symbol, ticker):
+        self.symbol = stock_symbol
+        self.ticker = ticker
+
+def html_fixture(name):
+    with open(os.path.join(HTML_DIR, name), 'rb') as f:
+        return f.read()
+
+def replay_page(url):
+    # Symbol-specific pages are used when recorded, otherwise every symbol gets the AAPL page
+    if "macrotrends.net" in url:
+        stock_symbol = url.split("/stocks/charts/")[1].split("/")[0]
+        page = "eps" if "eps-earnings-per-share-diluted" in url else "pe_ratio"
+        name = f"{page}_{stock_symbol}.html"
+        return html_fixture(name if os.path.exists(os.path.join(HTML_DIR, name)) else f"{page}_AAPL.html")
+    if "ycharts.com" in url:
+        return html_fixture("aaa_corporate_bond_yield.html")
+    if "finance.yahoo.com" in url:
+        return html_fixture("top_stocks_gainers.html")
+    raise ValueError(f"No recorded page for {url}")
+
+def replay_get(url, **kwargs):
+    return SimpleNamespace(status_code=200, content=replay_page(url), headers={})
+
+def replay_cached_get(url, parse, **kwargs):
+    # Always parses, so timings do not depend on what an earlier iteration left in the response cache
+    return parse(replay_page(url))
+
+def install_replay(tickers):
+    for domain in DEFAULT_RATE_LIMITS:
+        configure_rate_limit(domain, None)
+    getAaaCorporateBondYield.rate_limited_get = replay_get
+    getTopStock.rate_limited_get = replay_get
+    getEpsData.cached_get = replay_cached_get
+    getPeRatioData.cached_get = replay_cached_get
+    getBenjaminGrahamList.yf = SimpleNamespace(Ticker=lambda stock_symbol: tickers[stock_symbol])
+
+def load_universe(fixture_tickers):
+    # Every data.csv symbol without its own recording replays one of the recorded tickers in turn
+    with open(UNIVERSE_FILE, 'r', encoding='utf-8') as f:
+        universe_symbols = [row["Stock Symbol"] for row in csv.DictReader(f)]
+    recorded = list(fixture_tickers.values())
+    return {stock_symbol: fixture_tickers.get(stock_symbol, recorded[index % len(recorded)]) for index, stock_symbol in enumerate(universe_symbols)}
+
+def recorded_macro_inputs():
+    return {
+        "aaaCorporateBondYield": parse_percentage(getAaaCorporateBondYield.get_aaa_corporate_bond_yield()["aaaCorporateBondYield"]),
+        "riskFreeRate": RISK_FREE_RATE,
+        "expectedMarketReturn": EXPECTED_MARKET_RETURN,
+    }
+
+def value_symbols(tickers, macro_inputs):
+    pending = []
+    for stock_symbol, ticker in tickers.items():
+        stock = RecordedSnapshot(stock_symbol, ticker)
+        pending.append({
+            "symbol": stock_symbol,
+            "company_name": stock.info.get("longName"),
+            "inputs": {"dcf": get_dcf_inputs(stock), "ddm": get_ddm_inputs(stock), "graham": get_benjamin_graham_inputs(stock)},
+            "opening_price": get_opening_price(stock),
+            "beta": get_beta_value(stock),
+        })
+    results = value_universe(build_input_arrays([row["inputs"] for row in pending]), [row["opening_price"] for row in pending], macro_inputs)
+    return valuation_documents([row["symbol"] for row in pending], [row["company_name"] for row in pending], [row["beta"] for row in pending], results)
+
+def build_stages(symbol, tickers, universe, macro_inputs):
+    stock = RecordedSnapshot(symbol, tickers[symbol])
+    dcf_inputs = get_dcf_inputs(stock)
+    ddm_inputs = get_ddm_inputs(stock)
+    graham_inputs = get_benjamin_graham_inputs(stock)
+    universe_inputs = [getBenjaminGrahamList.load_graham_inputs(stock_symbol) for stock_symbol in universe]
+    eps_page = replay_page(f"https://www.macrotrends.net/stocks/charts/{symbol}/apple/eps-earnings-per-share-diluted")
+    pe_page = replay_page(f"https://www.macrotrends.net/stocks/charts/{symbol}/stock/pe-ratio")
+
+    # Single-symbol stages run per iteration; universe stages are whole sp500 runs
+    return {
+        "getEpsData.parse": lambda: getEpsData.parse_eps_data(symbol, eps_page),
+        "getPeRatioData.parse": lambda: getPeRatioData.parse_pe_ratio_data(symbol, pe_page),
+        "getAaaCorporateBondYield.parse": getAaaCorporateBondYield.get_aaa_corporate_bond_yield,
+        "getTopStock.parse": lambda: getTopStock.scrape_top_stocks("gainers"),
+        "getDCFValue.parse": lambda: get_dcf_inputs(stock),
+        "getDCFValue.compute": lambda: compute_dcf_value(symbol, dcf_inputs, macro_inputs),
+        "getDDMValue.parse": lambda: get_ddm_inputs(stock),
+        "getDDMValue.compute": lambda: compute_ddm_value(symbol, ddm_inputs, macro_inputs),
+        "getBenjaminGrahamValue.parse": lambda: get_benjamin_graham_inputs(stock),
+        "getBenjaminGrahamValue.compute": lambda: compute_benjamin_graham_value(symbol, graham_inputs, macro_inputs),
+        "getDCFSensitivity.compute": lambda: get_dcf_sensitivity(stock, seed=0, macro_inputs=macro_inputs),
+        "getBenjaminGrahamList": lambda: getBenjaminGrahamList.get_benjamin_graham_list(symbol),
+        "universe.valuations": lambda: value_symbols(universe, macro_inputs),
+        "universe.benjaminGrahamList": lambda: getBenjaminGrahamList.get_benjamin_graham_lists([getBenjaminGrahamList.load_graham_inputs(stock_symbol) for stock_symbol in universe]),
+        "universe.benjaminGrahamList.compute": lambda: getBenjaminGrahamList.get_benjamin_graham_lists(universe_inputs),
+    }
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, statistics.median(timings), peak
+
+def has_error(result):
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list):
+        return any(has_error(item) for item in result)
+    return False
+
+def run_benchmarks(symbol, iterations, universe_runs, only=None):
+    fixture_tickers = {stock_symbol: RecordedTicker(load_ticker_fixture(stock_symbol)) for stock_symbol in recorded_symbols()}
+    universe = load_universe(fixture_tickers)
+    install_replay({**fixture_tickers, **universe})
+    macro_inputs = recorded_macro_inputs()
+
+    results = []
+    for name, fn in build_stages(symbol, fixture_tickers, universe, macro_inputs).items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        result, seconds, peak = measure(fn, universe_runs if name.startswith("universe.") else iterations)
+        results.append({"benchmark": name, "ms": round(seconds * 1000, 3), "peakKiB": round(peak / 1024, 1), "ok": not has_error(result)})
+    return results
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCHMARKS_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--", ".."], cwd=BENCHMARKS_DIR, capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+def append_history(path, results):
+    commit, dirty = git_commit()
+    record = {
+        "commit": commit,
+        "dirty": dirty,
+        "recordedAt": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+def percent_change(current, previous):
+    if previous is None or not previous:
+        return "-"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline wall time and peak memory of every dataExtractor stage, replayed from recorded fixtures")
+    parser.add_argument("benchmarks", nargs="*", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--symbol", default="AAPL", help="Recorded symbol for the single-symbol stages")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--universe-runs", type=int, default=3, help="Timed runs of each whole-universe benchmark")
+    parser.add_argument("--history", nargs="?", const=HISTORY_FILE, help="Append results to a JSONL history keyed by git commit and compare with the previous entry")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.history:
+        history = load_history(args.history)
+        if history:
+            previous = {row["benchmark"]: row for row in history[-1]["results"]}
+            previous_commit = (history[-1]["commit"] or "unknown")[:10]
+
+    results = run_benchmarks(args.symbol, args.iterations, args.universe_runs, args.benchmarks)
+    if args.history:
+        append_history(args.history, results)
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        compare = f"  vs {previous_commit} (ms, KiB)" if previous else ""
+        print(f"{'benchmark':<34}{'median ms':>12}{'peak KiB':>12}{compare}")
+        for row in results:
+            line = f"{row['benchmark']:<34}{row['ms']:>12}{row['peakKiB']:>12}"
+            if previous:
+                before = previous.get(row["benchmark"], {})
+                line += f"  {percent_change(row['ms'], before.get('ms')):>8} {percent_change(row['peakKiB'], before.get('peakKiB')):>8}"
+            print(line + ("" if row["ok"] else "  ERROR"))
+
+    if not all(row["ok"] for row in results):
+        sys.exit(1)
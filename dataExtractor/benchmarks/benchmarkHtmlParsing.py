@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'stocks')))
+
+from htmlParsing import BACKENDS, find_table_rows, find_element_text, find_element
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+def top_stock_symbols(table):
+    return [tag.text.strip() for tag in table.find_all('span', attrs={'class': 'symbol'})] if table else None
+
+# Each page maps a backend to its extraction; "baseline" is the full html.parser tree the scrapers used to build.
+PAGES = {
+    "eps_AAPL.html": {
+        "baseline": lambda content: [[cell.text for cell in row.find_all("td")] for row in BeautifulSoup(content, "html.parser").find("table", class_="historical_data_table").find("tbody").find_all("tr")],
+        "backend": lambda content, backend: find_table_rows(content, "historical_data_table", backend),
+    },
+    "pe_ratio_AAPL.html": {
+        "baseline": lambda content: [[cell.text for cell in row.find_all("td")] for row in BeautifulSoup(content, "html.parser").find("table", class_="table").find("tbody").find_all("tr")],
+        "backend": lambda content, backend: find_table_rows(content, "table", backend),
+    },
+    "top_stocks_gainers.html": {
+        "baseline": lambda content: top_stock_symbols(BeautifulSoup(content, "html.parser").find('div', {'class': 'tableContainer yf-j24h8w'})),
+        "backend": lambda content, backend: top_stock_symbols(find_element(content, 'div', {'class': 'tableContainer yf-j24h8w'}, "html.parser" if backend == "html.parser" else "lxml")),
+    },
+    "aaa_corporate_bond_yield.html": {
+        "baseline": lambda content: BeautifulSoup(content, "html.parser").find('div', class_='key-stat-title').text,
+        "backend": lambda content, backend: find_element_text(content, 'div', 'key-stat-title', backend),
+    },
+}
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, statistics.median(timings), peak
+
+def run_benchmarks(iterations):
+    results = []
+    for page, extractors in PAGES.items():
+        with open(os.path.join(FIXTURES_DIR, page), 'rb') as f:
+            content = f.read()
+
+        expected, seconds, peak = measure(lambda: extractors["baseline"](content), iterations)
+        results.append({"page": page, "backend": "baseline", "ms": round(seconds * 1000, 3), "peakKiB": round(peak / 1024, 1), "matchesBaseline": True})
+
+        for backend in BACKENDS:
+            result, seconds, peak = measure(lambda: extractors["backend"](content, backend), iterations)
+            results.append({"page": page, "backend": backend, "ms": round(seconds * 1000, 3), "peakKiB": round(peak / 1024, 1), "matchesBaseline": result == expected})
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse time and peak memory per saved page for each HTML parser backend")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print(f"{'page':<32}{'backend':<14}{'median ms':>12}{'peak KiB':>12}  matches")
+        for row in results:
+            print(f"{row['page']:<32}{row['backend']:<14}{row['ms']:>12}{row['peakKiB']:>12}  {row['matchesBaseline']}")
+
+    if not all(row["matchesBaseline"] for row in results):
+        sys.exit(1)
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+STOCKS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'stocks'))
+
+HEAVY_MODULES = ("yfinance", "pandas", "numpy", "bs4", "lxml", "requests")
+
+# Cold-start import budget in ms per CLI entry point, and the heavy dependencies it must not load before first use
+BUDGETS = {
+    "getCostOfEquity": (50, HEAVY_MODULES),
+    "getAaaCorporateBondYield": (50, HEAVY_MODULES),
+    "getEpsData": (50, HEAVY_MODULES),
+    "getPeRatioData": (50, HEAVY_MODULES),
+    "getTopStock": (50, HEAVY_MODULES),
+    "searchStock": (150, HEAVY_MODULES),
+    "getDCFValue": (50, HEAVY_MODULES),
+    "getDDMValue": (50, HEAVY_MODULES),
+    "getBenjaminGrahamValue": (50, HEAVY_MODULES),
+    "getBetaValue": (50, HEAVY_MODULES),
+    "getOpeningPrice": (50, HEAVY_MODULES),
+    "getDCFSensitivity": (300, ("yfinance", "pandas", "bs4", "lxml", "requests")),
+    "getHistoricalData": (1500, ()),
+    "getStockData": (1500, ()),
+    "getStockProfile": (1500, ()),
+    "getAnalysis": (1500, ()),
+}
+
+# Time from interpreter start to the first upstream request when the script runs as a CLI, with the arguments
+# it is run with. Importing alone is not enough: a CLI that defers yfinance still pays for it before its first
+# request, and that is the latency a spawn-per-request caller sees.
+STARTUP_BUDGETS = {
+    "getAaaCorporateBondYield": (50, []),
+    "getEpsData": (50, ["AAPL"]),
+    "getPeRatioData": (50, ["AAPL"]),
+    "getTopStock": (50, ["most-active"]),
+    "getDCFValue": (1500, ["AAPL"]),
+    "getDDMValue": (1500, ["AAPL"]),
+    "getBenjaminGrahamValue": (1500, ["AAPL"]),
+    "getBetaValue": (1500, ["AAPL"]),
+    "getOpeningPrice": (1500, ["AAPL"]),
+    "getDCFSensitivity": (1500, ["AAPL"]),
+}
+
+# Every extractor reaches Yahoo, macrotrends and ycharts through rateLimiter, so replacing its two entry points
+# stops the run at the first request without touching the network
+STARTUP_RUNNER = """
+import json, os, runpy, sys, time
+started = time.perf_counter()
+sys.path.insert(0, os.getcwd())
+import rateLimiter
+
+def report(reached):
+    heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+    with open({result_file!r}, "w") as f:
+        json.dump({{"ms": (time.perf_counter() - started) * 1000, "reached": reached, "loaded": heavy}}, f)
+    os._exit(0)
+
+def first_request(*args, **kwargs):
+    report(True)
+
+rateLimiter.rate_limited_get = first_request
+rateLimiter.call_rate_limited = first_request
+sys.argv = [{script!r}] + {args!r}
+try:
+    runpy.run_path({script!r}, run_name="__main__")
+finally:
+    report(False)
+"""
+
+def measure_startup(module, args):
+    script = os.path.join(STOCKS_DIR, f"{module}.py")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result_file = os.path.join(cache_dir, "startup.json")
+        runner = STARTUP_RUNNER.format(heavy=HEAVY_MODULES, script=script, args=args, result_file=result_file)
+        # An empty cache directory, so nothing is answered from a previous run's cache
+        env = dict(os.environ, DATA_EXTRACTOR_CACHE_DIR=cache_dir)
+        process = subprocess.run([sys.executable, "-c", runner], cwd=STOCKS_DIR, env=env, capture_output=True, text=True)
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            raise RuntimeError(f"Running {module} failed:\n{process.stderr}")
+    if not result["reached"]:
+        raise RuntimeError(f"{module} finished without an upstream request; its startup budget measures nothing")
+    return result["ms"], set(result["loaded"])
+
+def measure_import(module):
+    # -X importtime reports "self | cumulative | name" in microseconds, nested imports indented under their parent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=STOCKS_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    total_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        loaded.add(name.strip().split(".")[0])
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_us = int(cumulative)
+    return total_us / 1000, loaded
+
+def check(modules, runs, scale):
+    results = []
+    for module in modules:
+        budget, forbidden = BUDGETS[module]
+        timings = []
+        for _ in range(runs):
+            milliseconds, loaded = measure_import(module)
+            timings.append(milliseconds)
+        milliseconds = min(timings)
+        heavy = sorted(set(forbidden) & loaded)
+        result = {
+            "module": module,
+            "ms": round(milliseconds, 1),
+            "budgetMs": budget * scale,
+            "heavyImports": heavy,
+            "ok": milliseconds <= budget * scale and not heavy,
+        }
+        if module in STARTUP_BUDGETS:
+            startup_budget, startup_args = STARTUP_BUDGETS[module]
+            startup_ms, startup_loaded = min((measure_startup(module, startup_args) for _ in range(runs)), key=lambda timing: timing[0])
+            result.update({
+                "startupMs": round(startup_ms, 1),
+                "startupBudgetMs": startup_budget * scale,
+                "startupImports": sorted(startup_loaded),
+            })
+            result["ok"] = result["ok"] and startup_ms <= startup_budget * scale
+        results.append(result)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail when a dataExtractor CLI entry point imports, or reaches its first request, slower than its budget")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module; the fastest run is compared")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. on slow CI machines")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = check(args.modules, args.runs, args.scale)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print(f"{'module':<28}{'import ms':>10}{'budget ms':>11}{'startup ms':>12}{'budget ms':>11}  heavy imports")
+        for row in results:
+            startup = f"{row['startupMs']:>12}{row['startupBudgetMs']:>11}" if "startupMs" in row else f"{'-':>12}{'-':>11}"
+            print(f"{row['module']:<28}{row['ms']:>10}{row['budgetMs']:>11}{startup}  {', '.join(row['heavyImports']) or '-'}{'' if row['ok'] else '  FAIL'}")
+
+    if not all(row["ok"] for row in results):
+        sys.exit(1)
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'stocks')))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+YFINANCE_DIR = os.path.join(FIXTURES_DIR, "yfinance")
+HTML_DIR = os.path.join(FIXTURES_DIR, "html")
+
+# Only the Ticker.info fields the extractors read, so fixtures stay small and diffs stay readable
+INFO_FIELDS = [
+    "longName",
+    "totalRevenue",
+    "currentRatio",
+    "priceToBook",
+    "marketCap",
+    "totalDebt",
+    "totalCash",
+    "beta",
+    "sharesOutstanding",
+    "floatShares",
+    "dividendRate",
+    "trailingEps",
+    "regularMarketOpen",
+    "mostRecentQuarter",
+    "lastFiscalYearEnd",
+    "lastDividendValue",
+    "lastDividendDate",
+]
+
+FRAMES = ["cashflow", "financials", "growth_estimates"]
+
+PAGES = {
+    "eps": "https://www.macrotrends.net/stocks/charts/{symbol}/apple/eps-earnings-per-share-diluted",
+    "pe_ratio": "https://www.macrotrends.net/stocks/charts/{symbol}/stock/pe-ratio",
+}
+
+def to_json_value(value):
+    if value is None or value != value:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
+
+def frame_to_json(frame):
+    return {
+        "index": [to_json_value(label) for label in frame.index],
+        "columns": [to_json_value(label) for label in frame.columns],
+        "data": [[to_json_value(value) for value in row] for row in frame.itertuples(index=False)],
+    }
+
+def frame_from_json(recorded):
+    import pandas as pd
+    columns = recorded["columns"]
+    # Statement columns are fiscal year ends; keep them as timestamps like yfinance does
+    if columns and all(isinstance(column, str) and column[:4].isdigit() and "-" in column for column in columns):
+        columns = pd.to_datetime(columns)
+    return pd.DataFrame(recorded["data"], index=recorded["index"], columns=columns, dtype=float)
+
+def series_to_json(series):
+    return {
+        "timezone": str(series.index.tz) if series.index.tz is not None else None,
+        "index": [label.isoformat() for label in series.index],
+        "data": [to_json_value(value) for value in series],
+    }
+
+def series_from_json(recorded, name="Dividends"):
+    import pandas as pd
+    index = pd.to_datetime(recorded["index"], utc=True)
+    index = index.tz_convert(recorded["timezone"]) if recorded["timezone"] else index.tz_localize(None)
+    return pd.Series(recorded["data"], index=pd.DatetimeIndex(index, name="Date"), name=name, dtype=float)
+
+def record_ticker(stock_symbol):
+    import yfinance as yf
+    stock = yf.Ticker(stock_symbol)
+    info = stock.info
+    recorded = {
+        "symbol": stock_symbol,
+        "info": {field: to_json_value(info[field]) for field in INFO_FIELDS if field in info},
+        "dividends": series_to_json(stock.dividends),
+    }
+    for frame in FRAMES:
+        recorded[frame] = frame_to_json(getattr(stock, frame))
+    return recorded
+
+def load_ticker_fixture(stock_symbol, fixtures_dir=YFINANCE_DIR):
+    with open(os.path.join(fixtures_dir, f"{stock_symbol}.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def recorded_symbols(fixtures_dir=YFINANCE_DIR):
+    return sorted(name[:-len(".json")] for name in os.listdir(fixtures_dir) if name.endswith(".json"))
+
+def record_page(url, path):
+    from httpClient import http_get
+    response = http_get(url)
+    response.raise_for_status()
+    with open(path, 'wb') as f:
+        f.write(response.content)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record live yfinance frames and macrotrends pages as offline benchmark fixtures")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--pages", action="store_true", help="Also save the EPS and PE ratio pages for each symbol")
+    args = parser.parse_args()
+
+    os.makedirs(YFINANCE_DIR, exist_ok=True)
+    for stock_symbol in args.symbols:
+        with open(os.path.join(YFINANCE_DIR, f"{stock_symbol}.json"), 'w', encoding='utf-8') as f:
+            json.dump(record_ticker(stock_symbol), f, indent=2)
+            f.write("\n")
+        print(f"Recorded {stock_symbol}")
+
+        if args.pages:
+            for page, url in PAGES.items():
+                record_page(url.format(symbol=stock_symbol), os.path.join(HTML_DIR, f"{page}_{stock_symbol}.html"))
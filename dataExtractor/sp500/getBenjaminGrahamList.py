@@ -1,168 +1,100 @@
 import yfinance as yf
 import sys
 import json
-import sys
+import math
+from numbers import Real
 sys.path.append('../stocks')
 from getEpsData import get_eps_data
 from getPeRatioData import get_pe_ratio_data
+from rateLimiter import call_rate_limited
+from grahamRules import build_universe, score_records
 
-def get_benjamin_graham_list(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
-    defensive_value = 0
-    defensive = ""
-    enterprising_value = 0
-    enterprising = ""
-    overall_value = 0
-    stock_data = {}
-    stock_info = stock.info
-    
-    company_name = stock_info.get('longName', None)
-    
-    # 1. total revenue
-    total_revenue = stock_info.get('totalRevenue', None)
-    if (total_revenue and total_revenue >= 100000000):
-        defensive_value += 1
-        defensive += "1"
-    else:
-        defensive += "0"
-        
-    if (total_revenue and total_revenue > 0):
-        enterprising_value += 1
-        enterprising += "1"
-    else:
-        enterprising += "0"
-    
-    
-    # 2. current ratio
-    current_ratio = stock_info.get('currentRatio', None)
-    if (current_ratio and current_ratio >= 2):
-        defensive_value += 1
-        defensive += "1"
-    else:
-        defensive += "0"
-        
-    if (current_ratio and current_ratio >= 1.5):
-        enterprising_value += 1
-        enterprising += "1"
-    else:
-        enterprising += "0"
-        
-    
-    # 3. EPS
-    eps = get_eps_data(stock_symbol)
-    if not eps or 'EPS_Data' not in eps:
-        defensive += "0"
-        enterprising += "0"
-    else:
-        eps_data = eps['EPS_Data']
-        sorted_eps_data = sorted(eps_data, key=lambda x: x['Year']) if len(eps_data) > 0 else []
+def to_number(value, field):
+    if not isinstance(value, Real):
+        raise TypeError(f"{field} is not a number: {value!r}")
+    return float(value)
 
-        if (len(sorted_eps_data) <= 10 and all(entry['EPS'] >= 0 for entry in sorted_eps_data)) or (len(sorted_eps_data) > 10 and all(entry['EPS'] >= 0 for entry in sorted_eps_data[-10:])):
-            defensive_value += 1
-            defensive += "1"
-        else:
-            defensive += "0"
+def to_optional_number(value, field):
+    # A missing or empty value fails its criterion; anything else must compare as a number, as the per-symbol
+    # checks required by raising TypeError
+    return to_number(value, field) if value else None
 
-        if (len(sorted_eps_data) <= 5 and all(entry['EPS'] >= 0 for entry in sorted_eps_data)) or (len(sorted_eps_data) > 5 and all(entry['EPS'] >= 0 for entry in sorted_eps_data[-5:])):
-            enterprising_value += 1
-            enterprising += "1"
-        else:
-            enterprising += "0"
-            
-    
-    # 4. Dividend
-    dividends = stock.dividends
-    dividend_by_year = dividends.groupby(dividends.index.year).max()
-    stock_data['dividends'] = [{"Year": int(year), "Dividend": dividend} for year, dividend in dividend_by_year.items()]
-    if (len(stock_data['dividends']) <= 20 and all(entry['Dividend'] > 0 for entry in stock_data['dividends'])) or (len(stock_data['dividends']) > 20 and all(entry['Dividend'] > 0 for entry in stock_data['dividends'][-20:])):
-        defensive_value += 1
-        defensive += "1"
-    else:
-        defensive += "0"
-        
-    if stock_data['dividends'] and stock_data['dividends'][-1]['Dividend'] > 0:
-        enterprising_value += 1
-        enterprising += "1"
-    else:
-        enterprising += "0"
+def read_until_failing(values, field, passes):
+    # all() in the per-symbol checks stopped at the first failing entry, so the entries after it were never compared
+    for value in values:
+        if not passes(to_number(value, field)):
+            return
+
+def check_eps_reads(eps_history):
+    # Converts the EPS entries the per-symbol checks compared, under the same conditions they compared them
+    read_until_failing(eps_history[-10:], 'EPS', lambda eps: eps >= 0)
+    read_until_failing(eps_history[-5:], 'EPS', lambda eps: eps >= 0)
+    if len(eps_history) >= 10 and sum(to_number(eps, 'EPS') for eps in eps_history[-10:-7]) > 0:
+        read_until_failing(eps_history[-3:], 'EPS', lambda eps: True)
+    if eps_history and to_number(eps_history[0], 'EPS') > 0:
+        to_number(eps_history[-1], 'EPS')
 
+def check_pe_reads(pe_history, price_to_book):
+    if len(pe_history) > 3:
+        read_until_failing(pe_history[:3], 'PE_Ratio', lambda pe: True)
+    if price_to_book and pe_history:
+        to_number(pe_history[0], 'PE_Ratio')
 
-    # 5. Earnings Growth
+def check_dividend_reads(dividends):
+    read_until_failing(dividends[-20:], 'Dividends', lambda dividend: dividend > 0)
+    if dividends:
+        to_number(dividends[-1], 'Dividends')
+
+def unread_as_nan(values):
+    # Whatever no check compared can only have decided nothing, so it just keeps the history's length
+    return [float(value) if isinstance(value, Real) else math.nan for value in values]
+
+def load_graham_inputs(stock_symbol):
+    # Fetches everything the Graham criteria read for one symbol, in the order the pages have always been requested.
+    # The values the per-symbol checks compared are converted here, so a symbol with bad data fails on its own
+    # instead of in the batch, and only where it failed before.
+    stock = yf.Ticker(stock_symbol)
+    stock_info = call_rate_limited("yahoo.com", lambda: stock.info)
+
+    eps = get_eps_data(stock_symbol)
     if not eps or 'EPS_Data' not in eps:
-        defensive += "0"
-        enterprising += "0"
+        eps_history = None
     else:
-        eps_data = eps['EPS_Data']
-        sorted_eps_data = sorted(eps_data, key=lambda x: x['Year'])
-        
-        if (len(sorted_eps_data) >= 10 and (sum([entry['EPS'] for entry in sorted_eps_data[-10:-7]]) > 0) and  (sum([entry['EPS'] for entry in sorted_eps_data[-3:]]) / 3) / (sum([entry['EPS'] for entry in sorted_eps_data[-10:-7]]) / 3) >= 4.0 / 3):
-            defensive_value += 1
-            defensive += "1"
-        else:
-            defensive += "0"
-            
-        if (sorted_eps_data and sorted_eps_data[0]['EPS'] > 0 and sorted_eps_data[-1]['EPS'] / sorted_eps_data[0]['EPS'] >= 1.0) and not (sorted_eps_data and sorted_eps_data[0]['EPS'] == 0 and sorted_eps_data[-1]['EPS'] >= 0):
-            enterprising_value += 1
-            enterprising += "1"
-        else:
-            enterprising += "0"
-            
-    
-    # 6. PE Ratio    
-    pe_ratio = get_pe_ratio_data(stock_symbol)
-    if pe_ratio and 'PE_Ratio_Data' in pe_ratio:
-        pe_ratio_data = pe_ratio['PE_Ratio_Data']
-        sortedPeData = sorted(pe_ratio_data, key=lambda x: x['Year'], reverse=True)
-        if len(sortedPeData) > 3 and round(sum(entry['PE_Ratio'] for entry in sortedPeData[:3]) / 3, 2) <= 15:
-            defensive_value += 1
-            defensive += "1"
-        else:
-            defensive += "0"
-    else:
-        defensive += "0"
+        eps_history = [entry['EPS'] for entry in sorted(eps['EPS_Data'], key=lambda x: x['Year'])]
+        check_eps_reads(eps_history)
+        eps_history = unread_as_nan(eps_history)
 
-        
-    enterprising_value += 1
-    enterprising += "1"
+    dividends = call_rate_limited("yahoo.com", lambda: stock.dividends)
+    dividend_by_year = dividends.groupby(dividends.index.year).max().tolist()
+    check_dividend_reads(dividend_by_year)
 
-        
-    # 7. Price to Assets
+    pe_ratio = get_pe_ratio_data(stock_symbol)
     if pe_ratio and 'PE_Ratio_Data' in pe_ratio:
-        pe_ratio_data = pe_ratio['PE_Ratio_Data']
-        sortedPeData = sorted(pe_ratio_data, key=lambda x: x['Year'], reverse=True)
+        pe_history = [entry['PE_Ratio'] for entry in sorted(pe_ratio['PE_Ratio_Data'], key=lambda x: x['Year'], reverse=True)]
         price_to_book = float(stock_info.get('priceToBook', None))
-        if (price_to_book and len(sortedPeData) > 0):
-            pe_ratio_value = round(sortedPeData[0]['PE_Ratio'] * price_to_book, 2)
-        else:
-            pe_ratio_value = None
-            
-        if pe_ratio_value and pe_ratio_value <= 22.5:
-            defensive_value += 1
-            defensive += "1"
-        else:
-            defensive += "0"
-            
-        if pe_ratio_value and pe_ratio_value <= 18:
-            enterprising_value += 1
-            enterprising += "1"
-        else:
-            enterprising += "0"
+        check_pe_reads(pe_history, price_to_book)
+        pe_history = unread_as_nan(pe_history)
     else:
-        defensive += "0"
-        enterprising += "0"
-        
-    overall_value = defensive_value + enterprising_value
-    
+        pe_history = None
+        price_to_book = None
+
     return {
-        "Stock Symbol": stock_symbol,
-        "Company Name": company_name,
-        "Defensive Value": defensive_value,
-        "Defensive": defensive,
-        "Enterprising Value": enterprising_value,
-        "Enterprising": enterprising,
-        "Overall Value": overall_value
+        "symbol": stock_symbol,
+        "company_name": stock_info.get('longName', None),
+        "total_revenue": to_optional_number(stock_info.get('totalRevenue', None), 'totalRevenue'),
+        "current_ratio": to_optional_number(stock_info.get('currentRatio', None), 'currentRatio'),
+        "price_to_book": price_to_book,
+        "eps": eps_history,
+        "dividends": unread_as_nan(dividend_by_year),
+        "pe_ratios": pe_history,
     }
 
+def get_benjamin_graham_lists(inputs):
+    return score_records(build_universe(inputs))
+
+def get_benjamin_graham_list(stock_symbol):
+    return get_benjamin_graham_lists([load_graham_inputs(stock_symbol)])[0]
+
 if __name__ == "__main__":
     stock_symbol = sys.argv[1]
     stock_data = get_benjamin_graham_list(stock_symbol)
@@ -0,0 +1,60 @@
+from pymongo import ASCENDING, UpdateOne
+from metrics import span
+
+# Fields the server sorts and filters company_valuations on (see sortAndFilterData in stockController.ts)
+SORT_FIELDS = [
+    "Beta",
+    "Percent DCF",
+    "Percent DDM",
+    "Percent Benjamin Graham",
+    "Percent Average",
+    "Percent Abs DCF",
+    "Percent Abs DDM",
+    "Percent Abs Benjamin Graham",
+    "Percent Abs Average",
+    "Intrinsic Value Standard Deviation",
+]
+
+class BulkValuationWriter:
+    # Builds the collection under a staging name and renames it over the live one on commit,
+    # so readers never see an empty or half-written collection during a rebuild.
+    def __init__(self, db, collection_name="company_valuations", batch_size=100, on_flush=None):
+        self.db = db
+        self.collection_name = collection_name
+        self.staging_name = f"{collection_name}_staging"
+        self.staging = db[self.staging_name]
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.buffer = []
+
+    def start(self, resume=False):
+        if not resume:
+            self.staging.drop()
+        self.staging.create_index([("Stock Symbol", ASCENDING)], unique=True)
+        for field in SORT_FIELDS:
+            self.staging.create_index([(field, ASCENDING)])
+
+    def add(self, doc):
+        self.buffer.append(doc)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        docs, self.buffer = self.buffer, []
+        operations = [UpdateOne({"Stock Symbol": doc["Stock Symbol"]}, {"$set": doc}, upsert=True) for doc in docs]
+        with span("persist"):
+            result = self.staging.bulk_write(operations, ordered=False)
+        print(f"Flushed {len(docs)} documents ({result.upserted_count} inserted, {result.modified_count} updated)")
+        if self.on_flush:
+            self.on_flush(docs)
+
+    def commit(self):
+        self.flush()
+        if self.staging.estimated_document_count() == 0:
+            print(f"Nothing written to '{self.staging_name}', keeping the current '{self.collection_name}'")
+            return
+        with span("persist"):
+            self.staging.rename(self.collection_name, dropTarget=True)
+        print(f"Swapped '{self.staging_name}' into '{self.collection_name}'")
@@ -1,46 +1,92 @@
 import pandas as pd
-import yfinance as yf
 import time
-import random
-from getBenjaminGrahamList import get_benjamin_graham_list
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from getBenjaminGrahamList import load_graham_inputs, get_benjamin_graham_lists
+from rateLimiter import configure_rate_limit
+from runJournal import RunJournal
+from metrics import span, symbol_scope, write_metrics
+
+parser = argparse.ArgumentParser(description="Compute the Benjamin Graham list for every S&P 500 company")
+parser.add_argument("--workers", type=int, default=4, help="Number of symbols processed concurrently")
+parser.add_argument("--macrotrends-rate", type=float, default=0.2, help="Requests per second allowed to macrotrends")
+parser.add_argument("--yahoo-rate", type=float, default=2.0, help="Requests per second allowed to Yahoo Finance")
+parser.add_argument("--fresh", action="store_true", help="Ignore the journal of an interrupted run and start over")
+parser.add_argument("--batch-size", type=int, default=50, help="Loaded symbols scored together; each is journaled as soon as it loads")
+parser.add_argument("--metrics", default="data", help="Write stage timings to <prefix>.metrics.jsonl and <prefix>.prom")
+args = parser.parse_args()
+
+configure_rate_limit("macrotrends.net", args.macrotrends_rate, capacity=2)
+configure_rate_limit("yahoo.com", args.yahoo_rate, capacity=5)
 
 total_start_time = time.time()
 input_file = "sp500_companies.csv"
 output_file = "data.csv"
+journal_file = "data.journal.jsonl"
 
 df = pd.read_csv(input_file)
 if "Symbol" not in df.columns:
     raise ValueError("CSV must contain a 'Symbol' column.")
 
-results = []
+symbols = df["Symbol"].tolist()
 
-counter = 1
+journal = RunJournal(journal_file, fresh=args.fresh)
+if journal.completed or journal.loaded:
+    print(f"Resuming run: {len(journal.completed)} symbols already processed, {len(journal.loaded)} loaded and waiting to be scored")
 
-for symbol in df["Symbol"].tolist():
+def load_symbol(counter, symbol):
+    start_time = time.time()
+    print(f"Processing {counter}: {symbol}...")
     try:
-        start_time = time.time()
-        print(f"Processing {counter}: {symbol}...")
-        result = get_benjamin_graham_list(symbol)
-        results.append(result)
-        print(f"Result: {result}")
+        with symbol_scope(symbol):
+            inputs = load_graham_inputs(symbol)
+        # Journaled before scoring, so an interrupted run never fetches a loaded symbol again
+        journal.record_loaded(symbol, inputs)
     except Exception as e:
+        journal.record_failure(symbol, e)
         print(f"Error processing {symbol}: {e}")
-    
-    end_time = time.time()
-    time_spent = end_time - start_time
-    print(f"Time spent processing {symbol}: {time_spent:.2f} seconds\n")
-    
-    sleep_time = random.uniform(15, 20)
-    print (f"Sleeping for {sleep_time:.2f} seconds...")
-    time.sleep(sleep_time)
-    
-    counter += 1
-    
-
-output_df = pd.DataFrame(results)
-output_df.to_csv(output_file, index=False)
+        inputs = None
+
+    time_spent = time.time() - start_time
+    print(f"Time spent loading {symbol}: {time_spent:.2f} seconds\n")
+    return inputs
+
+def score_pending(pending):
+    # Every loaded symbol is scored in one vectorized pass, then journaled so an interrupted run keeps it
+    if not pending:
+        return
+    with span("compute"):
+        results = get_benjamin_graham_lists(pending)
+    for result in results:
+        journal.record_success(result["Stock Symbol"], result)
+        print(f"Result: {result}")
+    pending.clear()
+
+pending = list(journal.loaded.values())
+with ThreadPoolExecutor(max_workers=args.workers) as executor:
+    futures = [
+        executor.submit(load_symbol, index + 1, symbol)
+        for index, symbol in enumerate(symbols)
+        if not journal.is_done(symbol) and symbol not in journal.loaded
+    ]
+    for future in as_completed(futures):
+        inputs = future.result()
+        if inputs is not None:
+            pending.append(inputs)
+        if len(pending) >= args.batch_size:
+            score_pending(pending)
+score_pending(pending)
+
+output_df = pd.DataFrame(journal.results(symbols))
+with span("persist"):
+    output_df.to_csv(output_file, index=False)
+
+if journal.failed:
+    print(f"Failed symbols: {', '.join(journal.failed)}")
+journal.close(remove=True)
 
 print(f"Processing complete. Data saved to {output_file}.")
 total_end_time = time.time()
 total_time_spent = total_end_time - total_start_time
 print(f"Total time spent: {total_time_spent:.2f} seconds")
+print("Metrics written to {} and {}".format(*write_metrics(args.metrics)))
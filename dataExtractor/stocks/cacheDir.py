@@ -0,0 +1,3 @@
+import os
+
+CACHE_DIR = os.getenv("DATA_EXTRACTOR_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache"))
@@ -0,0 +1,38 @@
+import numpy as np
+
+MIN_POINTS = 3
+
+def lttb_indices(x, y, max_points):
+    # Largest-Triangle-Three-Buckets: keeps the first and last bar and, from each bucket in between, the bar
+    # forming the largest triangle with the previously kept bar and the next bucket's average, so peaks and
+    # troughs survive. Each bucket depends on the previous pick, so only the bucket loop stays in Python.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = len(x)
+    if max_points is None or max_points < MIN_POINTS or size <= max_points:
+        return np.arange(size)
+
+    edges = np.floor(np.linspace(1, size - 1, max_points - 1)).astype(int)
+    y_filled = np.where(np.isnan(y), np.nanmean(y) if not np.isnan(y).all() else 0, y)
+
+    # Averages of every bucket, computed up front from cumulative sums
+    x_sums = np.concatenate(([0], np.cumsum(x)))
+    y_sums = np.concatenate(([0], np.cumsum(y_filled)))
+    counts = edges[1:] - edges[:-1]
+    x_means = (x_sums[edges[1:]] - x_sums[edges[:-1]]) / counts
+    y_means = (y_sums[edges[1:]] - y_sums[edges[:-1]]) / counts
+    next_x = np.append(x_means[1:], x[-1])
+    next_y = np.append(y_means[1:], y_filled[-1])
+
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = size - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bucket_x = x[start:end]
+        bucket_y = y_filled[start:end]
+        areas = np.abs((x[previous] - next_x[bucket]) * (bucket_y - y_filled[previous]) - (x[previous] - bucket_x) * (next_y[bucket] - y_filled[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
@@ -0,0 +1,157 @@
+import sys
+import json
+import argparse
+import os
+import socketserver
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from getStockData import get_stock_data
+from getStockProfile import get_stock_profile
+from getTopStock import get_top_stocks, start_refresher
+from getAnalysis import process_stock_analysis
+from getHistoricalData import get_historical_data
+from getEpsData import get_eps_data
+from getPeRatioData import get_pe_ratio_data
+from getAaaCorporateBondYield import get_aaa_corporate_bond_yield
+from searchStock import search_stock
+from getDCFValue import get_dcf_value
+from getDDMValue import get_ddm_value
+from getBenjaminGrahamValue import get_benjamin_graham_value
+from getBetaValue import get_beta_value
+from getOpeningPrice import get_opening_price
+
+FUNCTIONS = {
+    "get_stock_data": get_stock_data,
+    "get_stock_profile": get_stock_profile,
+    "get_top_stocks": get_top_stocks,
+    "process_stock_analysis": process_stock_analysis,
+    "get_historical_data": get_historical_data,
+    "get_eps_data": get_eps_data,
+    "get_pe_ratio_data": get_pe_ratio_data,
+    "get_aaa_corporate_bond_yield": get_aaa_corporate_bond_yield,
+    "search_stock": search_stock,
+    "get_dcf_value": get_dcf_value,
+    "get_ddm_value": get_ddm_value,
+    "get_benjamin_graham_value": get_benjamin_graham_value,
+    "get_beta_value": get_beta_value,
+    "get_opening_price": get_opening_price,
+}
+
+DEFAULT_TIMEOUT = 30
+# Exit code after a timed-out call; the pool restarts the worker because a hung thread cannot be cancelled
+RECYCLE_EXIT_CODE = 75
+
+executor = ThreadPoolExecutor(max_workers=4)
+recycle_requested = False
+
+def call_function(fn, args):
+    return FUNCTIONS[fn](*args)
+
+def protect_stdout():
+    # Extractors print debug output to stdout. Point fd 1 at stderr for the whole process once, and keep a
+    # private handle on the original stdout for protocol lines, so no call ever swaps sys.stdout under another.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return protocol
+
+def recycle():
+    # The hung call keeps its executor thread forever; hard-exit so the supervisor starts a fresh worker
+    sys.stderr.flush()
+    os._exit(RECYCLE_EXIT_CODE)
+
+def warm_up():
+    # The extractors import their heavy dependencies on first use so one-shot CLI runs start fast; a pooled
+    # worker pays for them once here, before it reports ready, instead of inside its first request
+    import numpy
+    import pandas
+    import yfinance
+    from htmlParsing import HAS_LXML, get_etree
+    from httpClient import get_session
+    if HAS_LXML:
+        get_etree()
+    get_session()
+
+def handle_request(line, timeout):
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError:
+        return {"id": None, "error": "Invalid JSON request"}
+
+    request_id = request.get("id")
+    fn = request.get("fn")
+    args = request.get("args", [])
+
+    if fn not in FUNCTIONS:
+        return {"id": request_id, "error": f"Unknown function: {fn}"}
+    if not isinstance(args, list):
+        return {"id": request_id, "error": "'args' must be a list"}
+
+    future = executor.submit(call_function, fn, args)
+    try:
+        result = future.result(timeout=request.get("timeout", timeout))
+    except FutureTimeoutError:
+        global recycle_requested
+        recycle_requested = True
+        return {"id": request_id, "error": f"Request timed out: {fn}"}
+    except Exception as e:
+        return {"id": request_id, "error": str(e)}
+
+    return {"id": request_id, "result": result}
+
+def encode_response(response):
+    try:
+        return json.dumps(response) + "\n"
+    except (TypeError, ValueError) as e:
+        return json.dumps({"id": response.get("id"), "error": f"Failed to serialize result: {e}"}) + "\n"
+
+def serve_stdio(timeout):
+    protocol = protect_stdout()
+    protocol.write(json.dumps({"ready": True}) + "\n")
+    protocol.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        protocol.write(encode_response(handle_request(line, timeout)))
+        protocol.flush()
+        if recycle_requested:
+            recycle()
+
+def serve_socket(socket_path, timeout):
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                self.wfile.write(encode_response(handle_request(line, timeout)).encode("utf-8"))
+                self.wfile.flush()
+                if recycle_requested:
+                    recycle()
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    protect_stdout()
+    with socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler) as server:
+        server.daemon_threads = True
+        server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived worker serving newline-delimited JSON extractor requests")
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--no-refresher", action="store_true", help="Do not keep the top stock categories refreshed in the background")
+    parser.add_argument("--no-warm-up", action="store_true", help="Import heavy dependencies on the first request instead of at startup")
+    args = parser.parse_args()
+
+    if not args.no_warm_up:
+        warm_up()
+
+    if not args.no_refresher:
+        start_refresher()
+
+    if args.socket:
+        serve_socket(args.socket, args.timeout)
+    else:
+        serve_stdio(args.timeout)
@@ -0,0 +1,28 @@
+import fcntl
+import os
+from contextlib import contextmanager
+
+# Advisory locks on a side file, shared by every process that uses the same cache directory.
+# The kernel drops a lock when its holder exits, so a killed process never leaves one behind.
+
+@contextmanager
+def file_lock(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def try_lock(path):
+    # Returns the open lock file while this process holds the lock, or None if another process does.
+    # Keep the returned file referenced for as long as the lock should be held.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    f = open(path, 'a')
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
@@ -1,13 +1,19 @@
-import yfinance as yf
 import sys
 import json
-from getAaaCorporateBondYield import get_aaa_corporate_bond_yield
+from macroInputs import get_macro_inputs
+from metrics import span
+from stockSnapshot import get_snapshot
 
-def get_benjamin_graham_value(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
-    eps = stock.info.get("trailingEps", None)
-    growth = stock.growth_estimates.get("stockTrend", {}).get("+1y", 0)*100
-    current_yield = float(get_aaa_corporate_bond_yield()['aaaCorporateBondYield'][:-1])
+def get_benjamin_graham_inputs(stock):
+    return {
+        "eps": stock.info.get("trailingEps", None),
+        "growth": float(stock.growth_estimates.get("stockTrend", {}).get("+1y", 0)*100),
+    }
+
+def compute_benjamin_graham_value(stock_symbol, inputs, macro_inputs):
+    eps = inputs["eps"]
+    growth = inputs["growth"]
+    current_yield = macro_inputs["aaaCorporateBondYield"]
     intrinsic_value = round(eps * (8.5 + 2 * growth) * 4.4 / current_yield, 2)
 
     return {
@@ -18,6 +24,14 @@ def get_benjamin_graham_value(stock_symbol):
         "BenjaminGrahamIntrinsicValue": intrinsic_value,
     }
 
+def get_benjamin_graham_value(stock_symbol, macro_inputs=None):
+    stock = get_snapshot(stock_symbol)
+    macro_inputs = macro_inputs or get_macro_inputs()
+    with span("parse"):
+        inputs = get_benjamin_graham_inputs(stock)
+    with span("compute"):
+        return compute_benjamin_graham_value(stock.symbol, inputs, macro_inputs)
+
 if __name__ == "__main__":
     stock_symbol = sys.argv[1]
     stock_data = get_benjamin_graham_value(stock_symbol)
@@ -1,9 +1,9 @@
-import yfinance as yf
 import sys
 import json
+from stockSnapshot import get_snapshot
 
 def get_beta_value(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
+    stock = get_snapshot(stock_symbol)
 
     return stock.info.get('beta')
 
@@ -1,6 +1,6 @@
-def get_cost_of_equity(beta):
-    risk_free_rate = 0.045
-    expected_market_return = 0.10
+RISK_FREE_RATE = 0.045
+EXPECTED_MARKET_RETURN = 0.10
+
+def get_cost_of_equity(beta, risk_free_rate=RISK_FREE_RATE, expected_market_return=EXPECTED_MARKET_RETURN):
     cost_of_equity = risk_free_rate + beta * (expected_market_return - risk_free_rate)
     return cost_of_equity
-
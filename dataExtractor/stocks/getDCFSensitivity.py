@@ -0,0 +1,86 @@
+import sys
+import json
+import numpy as np
+from getDCFValue import get_dcf_inputs
+from stockSnapshot import get_snapshot
+from macroInputs import get_rate_inputs
+from valuationEngine import build_input_arrays, compute_wacc, compute_dcf_from_rates
+
+GRID_STEPS = 5
+WACC_STEP = 0.005
+GROWTH_STEP = 0.01
+DEFAULT_DRAWS = 10000
+WACC_STDDEV = 0.01
+GROWTH_STDDEV = 0.02
+MIN_WACC = 0.01
+PERCENTILES = [5, 25, 50, 75, 95]
+
+def round_value(value):
+    return round(float(value), 2) if np.isfinite(value) else None
+
+def get_dcf_sensitivity(stock_symbol, draws=DEFAULT_DRAWS, seed=None, macro_inputs=None):
+    stock = get_snapshot(stock_symbol)
+    macro_inputs = macro_inputs or get_rate_inputs()
+    inputs = get_dcf_inputs(stock)
+
+    arrays = build_input_arrays([{"dcf": inputs}])
+    base_wacc = float(compute_wacc(arrays, macro_inputs)[0])
+    base_growth = inputs["growth_rate"]
+    if np.isnan(base_wacc):
+        return {"error": f"Missing market cap or beta for {stock_symbol}"}
+
+    def intrinsic_values(wacc, growth_rate):
+        return compute_dcf_from_rates(
+            arrays["dcf_free_cashflow"][0],
+            growth_rate,
+            wacc,
+            np.nan_to_num(arrays["dcf_total_debt"][0]),
+            np.nan_to_num(arrays["dcf_total_cash"][0]),
+            arrays["dcf_shares_outstanding"][0],
+        )
+
+    # Grid centred on the company's own WACC and growth; every cell is evaluated in one broadcast
+    offsets = np.arange(-GRID_STEPS, GRID_STEPS + 1)
+    wacc_axis = np.maximum(base_wacc + offsets * WACC_STEP, MIN_WACC)
+    growth_axis = base_growth + offsets * GROWTH_STEP
+    grid = intrinsic_values(wacc_axis[:, np.newaxis], growth_axis[np.newaxis, :])
+
+    rng = np.random.default_rng(seed)
+    wacc_draws = np.maximum(rng.normal(base_wacc, WACC_STDDEV, draws), MIN_WACC)
+    growth_draws = rng.normal(base_growth, GROWTH_STDDEV, draws)
+    simulated = intrinsic_values(wacc_draws, growth_draws)
+    simulated = simulated[np.isfinite(simulated)]
+
+    return {
+        "Symbol": stock.symbol,
+        "WACC": round(base_wacc * 100, 2),
+        "GrowthRate": round(base_growth * 100, 2),
+        "DCFIntrinsicValue": round_value(intrinsic_values(base_wacc, base_growth)),
+        "Sensitivity": {
+            "WACC": [round(float(wacc) * 100, 2) for wacc in wacc_axis],
+            "GrowthRate": [round(float(growth) * 100, 2) for growth in growth_axis],
+            "DCFIntrinsicValues": [[round_value(value) for value in row] for row in grid],
+        },
+        "MonteCarlo": {
+            "Draws": draws,
+            "WACCStdDev": round(WACC_STDDEV * 100, 2),
+            "GrowthRateStdDev": round(GROWTH_STDDEV * 100, 2),
+            "Mean": round(float(simulated.mean()), 2) if simulated.size else None,
+            "Percentiles": {
+                str(percentile): round(float(value), 2)
+                for percentile, value in zip(PERCENTILES, np.percentile(simulated, PERCENTILES))
+            } if simulated.size else {},
+        },
+    }
+
+def lambda_handler(event, context):
+    stock_symbol = event.get("stock_symbol")
+    draws = int(event.get("draws") or DEFAULT_DRAWS)
+    stock_data = get_dcf_sensitivity(stock_symbol, draws)
+    return json.dumps(stock_data, indent=4)
+
+if __name__ == "__main__":
+    stock_symbol = sys.argv[1]
+    draws = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DRAWS
+    stock_data = get_dcf_sensitivity(stock_symbol, draws)
+    print(json.dumps(stock_data, indent=4))
@@ -1,11 +1,12 @@
-import yfinance as yf
 import sys
 import json
 from getCostOfEquity import get_cost_of_equity
+from stockSnapshot import get_snapshot
+from macroInputs import get_rate_inputs
+from metrics import span
 
-def get_dcf_value(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
-    
+def get_dcf_inputs(stock):
+    stock_info = stock.info
     free_cashflow_list = stock.cashflow.loc["Free Cash Flow"].dropna()
 
     try:
@@ -14,9 +15,33 @@ def get_dcf_value(stock_symbol):
         free_cashflow = 0
 
     growth_rate = ((free_cashflow_list.iloc[0] / free_cashflow_list.iloc[-1]) ** (1 / len(free_cashflow_list)) - 1).real
-    market_cap = stock.info.get("marketCap", None)
-    total_debt = stock.info.get("totalDebt", None)
-    total_cash = stock.info.get("totalCash", None)
+
+    try:
+        interest_expense = float(stock.financials.loc["Interest Expense"].dropna().iloc[0])
+    except:
+        interest_expense = None
+
+    shares_outstanding = stock_info.get("sharesOutstanding", None)
+    if not shares_outstanding:
+        shares_outstanding = stock_info.get("floatShares", None)
+
+    return {
+        "free_cashflow": float(free_cashflow),
+        "growth_rate": float(growth_rate),
+        "market_cap": stock_info.get("marketCap", None),
+        "total_debt": stock_info.get("totalDebt", None),
+        "total_cash": stock_info.get("totalCash", None),
+        "beta": stock_info.get("beta", 0),
+        "interest_expense": interest_expense,
+        "shares_outstanding": shares_outstanding,
+    }
+
+def compute_dcf_value(stock_symbol, inputs, macro_inputs):
+    free_cashflow = inputs["free_cashflow"]
+    growth_rate = inputs["growth_rate"]
+    market_cap = inputs["market_cap"]
+    total_debt = inputs["total_debt"]
+    total_cash = inputs["total_cash"]
     
     if not total_cash:
         total_cash = 0
@@ -25,13 +50,13 @@ def get_dcf_value(stock_symbol):
 
     total_value = market_cap + total_debt
 
-    beta = stock.info.get("beta", 0)
-    cost_of_equity = get_cost_of_equity(beta)
+    beta = inputs["beta"]
+    cost_of_equity = get_cost_of_equity(beta, macro_inputs["riskFreeRate"], macro_inputs["expectedMarketReturn"])
 
-    try:
-        interest_expense = stock.financials.loc["Interest Expense"].dropna().iloc[0]
-        cost_of_debt = (interest_expense / total_debt) * (1 - 0.21) if total_debt else 0.03
-    except:
+    interest_expense = inputs["interest_expense"]
+    if interest_expense is not None and total_debt:
+        cost_of_debt = (interest_expense / total_debt) * (1 - 0.21)
+    else:
         cost_of_debt = 0.03
 
     if total_value > 0:
@@ -51,10 +76,7 @@ def get_dcf_value(stock_symbol):
     enterprise_value = total_pv + discounted_terminal_value
     net_debt = total_debt - total_cash
 
-    shares_outstanding = stock.info.get("sharesOutstanding", None)
-    if not shares_outstanding:
-        shares_outstanding = stock.info.get("floatShares", None)
-
+    shares_outstanding = inputs["shares_outstanding"]
     if shares_outstanding:
         intrinsic_value = round((enterprise_value - net_debt) / shares_outstanding,2)
     else:
@@ -70,6 +92,15 @@ def get_dcf_value(stock_symbol):
         "DCFIntrinsicValue": intrinsic_value,
     }
 
+def get_dcf_value(stock_symbol, macro_inputs=None):
+    stock = get_snapshot(stock_symbol)
+    macro_inputs = macro_inputs or get_rate_inputs()
+    # Ticker frames are fetched lazily inside the inputs step; those fetches are their own spans
+    with span("parse"):
+        inputs = get_dcf_inputs(stock)
+    with span("compute"):
+        return compute_dcf_value(stock.symbol, inputs, macro_inputs)
+
 if __name__ == "__main__":
     stock_symbol = sys.argv[1]
     stock_data = get_dcf_value(stock_symbol)
@@ -1,16 +1,27 @@
-import yfinance as yf
 import sys
 import json
 from getCostOfEquity import get_cost_of_equity
+from stockSnapshot import get_snapshot
+from macroInputs import get_rate_inputs
+from metrics import span
 
-def get_ddm_value(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
-    
-    dividend = stock.info.get("dividendRate", 0)
-    growth_rate = round((lambda d: (d.iloc[-1] / d.iloc[0]) ** (1 / (len(d) - 1)) - 1 if len(d) > 1 else 0)(stock.dividends.groupby(stock.dividends.index.year).max()),6)
+def get_ddm_inputs(stock):
+    stock_info = stock.info
+    dividends = stock.dividends
+    growth_rate = round((lambda d: (d.iloc[-1] / d.iloc[0]) ** (1 / (len(d) - 1)) - 1 if len(d) > 1 else 0)(dividends.groupby(dividends.index.year).max()),6)
+
+    return {
+        "dividend": stock_info.get("dividendRate", 0),
+        "growth_rate": float(growth_rate),
+        "beta": stock_info.get("beta", 0),
+    }
+
+def compute_ddm_value(stock_symbol, inputs, macro_inputs):
+    dividend = inputs["dividend"]
+    growth_rate = inputs["growth_rate"]
     
-    beta = stock.info.get("beta", 0)
-    cost_of_equity = round(get_cost_of_equity(beta),6)
+    beta = inputs["beta"]
+    cost_of_equity = round(get_cost_of_equity(beta, macro_inputs["riskFreeRate"], macro_inputs["expectedMarketReturn"]),6)
     
     intrinsic_value = round(dividend * (1 + growth_rate) / (cost_of_equity - growth_rate), 2)
     
@@ -23,6 +34,14 @@ def get_ddm_value(stock_symbol):
         "DDMIntrinsicValue": intrinsic_value,
     }
 
+def get_ddm_value(stock_symbol, macro_inputs=None):
+    stock = get_snapshot(stock_symbol)
+    macro_inputs = macro_inputs or get_rate_inputs()
+    with span("parse"):
+        inputs = get_ddm_inputs(stock)
+    with span("compute"):
+        return compute_ddm_value(stock.symbol, inputs, macro_inputs)
+
 if __name__ == "__main__":
     stock_symbol = sys.argv[1]
     stock_data = get_ddm_value(stock_symbol)
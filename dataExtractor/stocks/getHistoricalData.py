@@ -1,33 +1,65 @@
 import yfinance as yf
-import sys
+import numpy as np
+import pandas as pd
+from downsampling import lttb_indices
+from priceStore import PriceStore
+import argparse
+import re
 import json
 
-def get_historical_data(stock_symbol, range_param):
-    stock = yf.Ticker(stock_symbol)
-    
-    interval_mapping = {
-        '1d': '5m',
-        '5d': '60m',
-        '1mo': '90m',
-        '3mo': '1d',
-        '6mo': '5d',
-        'ytd': '5d',
-        '1y': '5d',
-        '5y': '1mo',
-        '10y': '1mo',
-        'max': '3mo'
+FORMATS = ('rows', 'columns')
+
+INTERVAL_MAPPING = {
+    '1d': '5m',
+    '5d': '60m',
+    '1mo': '90m',
+    '3mo': '1d',
+    '6mo': '5d',
+    'ytd': '5d',
+    '1y': '5d',
+    '5y': '1mo',
+    '10y': '1mo',
+    'max': '3mo'
+}
+
+# Each intraday interval serves exactly one range, so its store never needs bars older than that range
+INTRADAY_RETENTION = {interval: range_param for range_param, interval in INTERVAL_MAPPING.items() if re.fullmatch(r"\d+m", interval)}
+
+_price_store = PriceStore(retention=INTRADAY_RETENTION)
+
+def serialize_history(history, output_format='rows'):
+    # Formats the whole index and Close column at once; "columns" returns parallel lists instead of one dict per bar.
+    # strftime walks the index element by element, so slice ISO strings of the exchange wall-clock times instead.
+    if history.empty:
+        # yfinance returns an untyped empty index when there are no bars
+        return {"date": [], "time": [], "price": []} if output_format == 'columns' else []
+    index = history.index.tz_localize(None) if getattr(history.index, "tz", None) is not None else history.index
+    timestamps = pd.Series(np.datetime_as_string(index.values, unit="s"), dtype=object)
+    columns = {
+        "date": timestamps.str.slice(0, 10).tolist(),
+        "time": timestamps.str.slice(11, 19).tolist(),
+        "price": history["Close"].round(2).tolist(),
     }
+    if output_format == 'columns':
+        return columns
+    return [{"date": date, "time": time, "price": price} for date, time, price in zip(columns["date"], columns["time"], columns["price"])]
+
+def get_historical_data(stock_symbol, range_param='1d', output_format='rows', max_points=None):
+    if output_format not in FORMATS:
+        return {"error": f"Invalid format: {output_format}. Valid formats are: {', '.join(FORMATS)}"}
+
+    stock = yf.Ticker(stock_symbol)
     
-    interval = interval_mapping.get(range_param, '1d')
+    interval = INTERVAL_MAPPING.get(range_param, '1d')
     
-    stock_info = stock.history(period=range_param, interval=interval)
-    json_data = []
-    for index, row in stock_info.iterrows():
-        json_data.append({
-            "date": index.strftime("%Y-%m-%d"),
-            "time": index.strftime("%H:%M:%S"),
-            "price": round(row["Close"], 2)
-        })
+    if range_param in INTERVAL_MAPPING:
+        stock_info = _price_store.get_history(stock, stock_symbol, range_param, interval)
+    else:
+        stock_info = stock.history(period=range_param, interval=interval)
+    if max_points and not stock_info.empty:
+        # Charts cannot show more points than the screen has pixels; keep the bars that preserve the shape
+        stock_info = stock_info.iloc[lttb_indices(stock_info.index.asi8, stock_info["Close"].to_numpy(), int(max_points))]
+    json_data = serialize_history(stock_info, output_format)
     stock_data = {}
     stock_data['symbol'] = stock_symbol
     stock_data['range'] = range_param
@@ -40,13 +72,19 @@ def get_historical_data(stock_symbol, range_param):
 def lambda_handler(event, context):
     stock_symbol = event.get("stock_symbol")
     range_param = event.get("range_param") if event.get("range_param") else '1d'
+    output_format = event.get("format") if event.get("format") else 'rows'
+    max_points = event.get("max_points")
 
-    stock_data = get_historical_data(stock_symbol, range_param)
+    stock_data = get_historical_data(stock_symbol, range_param, output_format, max_points)
     return stock_data
 
 if __name__ == "__main__":
-    stock_symbol = sys.argv[1]
-    range_param = sys.argv[2] if len(sys.argv) > 2 else '1d'
+    parser = argparse.ArgumentParser()
+    parser.add_argument("stock_symbol")
+    parser.add_argument("range_param", nargs="?", default='1d')
+    parser.add_argument("--format", choices=FORMATS, default='rows')
+    parser.add_argument("--max-points", type=int, help="Downsample the series to at most this many points")
+    args = parser.parse_args()
 
-    stock_data = get_historical_data(stock_symbol, range_param)
+    stock_data = get_historical_data(args.stock_symbol, args.range_param, args.format, args.max_points)
     print(json.dumps(stock_data))
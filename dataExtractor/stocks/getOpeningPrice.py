@@ -1,9 +1,9 @@
-import yfinance as yf
 import sys
 import json
+from stockSnapshot import get_snapshot
 
 def get_opening_price(stock_symbol):
-    stock = yf.Ticker(stock_symbol)
+    stock = get_snapshot(stock_symbol)
     return stock.info.get('regularMarketOpen', None)
 
 if __name__ == "__main__":
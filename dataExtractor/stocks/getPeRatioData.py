@@ -1,48 +1,33 @@
-import requests
 import json
 import sys
-import random
-from bs4 import BeautifulSoup
-
-USER_AGENTS = [
-    "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Mobile Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Linux aarch64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36 CrKey/1.54.250320",
-    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Mobile Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Mobile Safari/537.36"
-]
+from htmlParsing import find_table_rows
+from responseCache import cached_get
+from metrics import span
+
+def parse_pe_ratio_data(stock_symbol, content):
+    with span("parse"):
+        return _parse_pe_ratio_data(stock_symbol, content)
+
+def _parse_pe_ratio_data(stock_symbol, content):
+    rows = find_table_rows(content, "table")
+    if rows is None:
+        return {"error": "Could not find the PE ratio data table on the page."}
+
+    pe_ratio_data = []
+    for index, cells in enumerate(rows):
+        if index % 4 == 3:
+            if len(cells) >= 3:
+                year = int(cells[0].strip()[:4])
+                pe_ratio = float(cells[3].strip().replace(',', ''))
+                if pe_ratio != "":
+                    pe_ratio_data.append({"Year": year, "PE_Ratio": pe_ratio})
+
+    pe_ratio_data.sort(key=lambda x: x["Year"])
+    return {"Symbol": stock_symbol, "PE_Ratio_Data": pe_ratio_data}
 
 def get_pe_ratio_data(stock_symbol):
     url = f"https://www.macrotrends.net/stocks/charts/{stock_symbol}/stock/pe-ratio"
-    headers = {"User-Agent": random.choice(USER_AGENTS)}
-    response = requests.get(url, headers=headers)
-
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.content, "html.parser")
-        try:
-            table = soup.find("table", class_="table")
-            pe_ratio_data = []
-
-            rows = table.find("tbody").find_all("tr")
-            for index, row in enumerate(rows):
-                if index % 4 == 3:
-                    cells = row.find_all("td")
-                    if len(cells) >= 3:
-                        year = int(cells[0].text.strip()[:4])
-                        pe_ratio = float(cells[3].text.strip().replace(',', ''))
-                        if pe_ratio != "":
-                            pe_ratio_data.append({"Year": year, "PE_Ratio": pe_ratio})
-
-            pe_ratio_data.sort(key=lambda x: x["Year"])
-            return {"Symbol": stock_symbol, "PE_Ratio_Data": pe_ratio_data}
-
-        except AttributeError:
-            return {"error": "Could not find the PE ratio data table on the page."}
-    else:
-        return {"error": f"Failed to retrieve the webpage. Status code: {response.status_code}"}
+    return cached_get(url, lambda content: parse_pe_ratio_data(stock_symbol, content))
 
 def lambda_handler(event, context):
     stock_symbol = event.get("stock_symbol")
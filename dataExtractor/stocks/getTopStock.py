@@ -1,92 +1,215 @@
-import requests
-from bs4 import BeautifulSoup
+from htmlParsing import find_element
+from rateLimiter import rate_limited_get
+from cacheDir import CACHE_DIR
+from metrics import span
+from fileLock import try_lock
 import json
 import re
-import random
 import sys
+import threading
+import time
 from datetime import datetime
 import pytz
 import os
 
-USER_AGENTS = [
-   "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Mobile Safari/537.36",
-   "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-   "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-   "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15",
-   "Mozilla/5.0 (X11; Linux aarch64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36 CrKey/1.54.250320",
-   "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-   "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"
-]
+CATEGORY_URLS = {
+   "most-active": "https://finance.yahoo.com/markets/stocks/most-active/",
+   "trending": "https://finance.yahoo.com/trending-tickers/",
+   "gainers": "https://finance.yahoo.com/markets/stocks/gainers/",
+   "losers": "https://finance.yahoo.com/markets/stocks/losers/",
+   "52-week-gainers": "https://finance.yahoo.com/markets/stocks/52-week-gainers/",
+   "52-week-losers": "https://finance.yahoo.com/markets/stocks/52-week-losers/"
+}
 
-def get_top_stocks(category="most-active"):
-    category_urls = {
-       "most-active": "https://finance.yahoo.com/markets/stocks/most-active/",
-       "trending": "https://finance.yahoo.com/trending-tickers/",
-       "gainers": "https://finance.yahoo.com/markets/stocks/gainers/",
-       "losers": "https://finance.yahoo.com/markets/stocks/losers/",
-       "52-week-gainers": "https://finance.yahoo.com/markets/stocks/52-week-gainers/",
-       "52-week-losers": "https://finance.yahoo.com/markets/stocks/52-week-losers/"
-    }
-   
-    if category not in category_urls:
-       return {"error": f"Invalid category: {category}. Valid categories are: {', '.join(category_urls.keys())}"}
-   
-    url = category_urls[category]
-    headers = {
-        "User-Agent": random.choice(USER_AGENTS)
-    }
-   
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        data = []
-        table = soup.find('div', {'class': 'tableContainer yf-j24h8w'})
-        if (table):
-            rows = table.find_all('tr')
-            for row in rows[1:11]:
-               stock = {}
-               symbol_tag = row.find('span', attrs={'class': 'symbol'})
-               stock['Symbol'] = symbol_tag.text.strip() if symbol_tag else 'N/A'
-               
-               name_tag = row.find_all('td')[1].find('div')
-               stock['Company Name'] = name_tag.text if name_tag else 'N/A'
-               
-               price_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketPrice'})
-               stock['Price'] = price_tag.text if price_tag else 'N/A'
-               
-               change_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketChange'})
-               stock['Change'] = change_tag.text if change_tag else 'N/A'
-               
-               change_percent_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketChangePercent'})
-               stock['Change%'] = re.sub(r'^\(|\)$', '', change_percent_tag.text) if change_percent_tag else 'N/A'
-               
-               data.append(stock)
-        
-        if not data:
-            backup_file = f'./backupData/{category}.json'
-            if os.path.exists(backup_file):
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                return {"error": "No backup data found.|"+backup_file+"| Please check the backup file."}
-        
-        stocks_data = {}
-        stocks_data['data'] = data
-        edt_timezone = pytz.timezone('America/New_York')
-        current_time_edt = datetime.now(edt_timezone).strftime('%A, %d %B %Y at %H:%M %Z')
-        stocks_data['retrievedAt'] = current_time_edt
-       
-        return stocks_data
-    else:
+BACKUP_FILES = {
+   "most-active": "mostActive.json",
+   "trending": "trending.json",
+   "gainers": "gainers.json",
+   "losers": "losers.json",
+   "52-week-gainers": "52WeekGainers.json",
+   "52-week-losers": "52WeekLosers.json"
+}
+
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backupData")
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "topStocks")
+REFRESHER_LOCK_FILE = os.path.join(SNAPSHOT_DIR, "refresher.lock")
+
+# A snapshot older than this is still served while a refresher runs; without one it is refreshed before answering
+STALE_AFTER = int(os.getenv("TOP_STOCKS_STALE_AFTER", 300))
+REFRESH_INTERVAL = int(os.getenv("TOP_STOCKS_REFRESH_INTERVAL", 300))
+
+_snapshots = {}
+_refreshing = set()
+_refresher = None
+_lock = threading.Lock()
+
+def scrape_top_stocks(category):
+    response = rate_limited_get(CATEGORY_URLS[category])
+    if response.status_code != 200:
         return {"error": f"Failed to retrieve data. Status code: {response.status_code}"}
 
+    with span("parse"):
+        return parse_top_stocks(response.content)
+
+def parse_top_stocks(content):
+    data = []
+    table = find_element(content, 'div', {'class': 'tableContainer yf-j24h8w'})
+    if (table):
+        rows = table.find_all('tr')
+        for row in rows[1:11]:
+           stock = {}
+           symbol_tag = row.find('span', attrs={'class': 'symbol'})
+           stock['Symbol'] = symbol_tag.text.strip() if symbol_tag else 'N/A'
+
+           name_tag = row.find_all('td')[1].find('div')
+           stock['Company Name'] = name_tag.text if name_tag else 'N/A'
+
+           price_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketPrice'})
+           stock['Price'] = price_tag.text if price_tag else 'N/A'
+
+           change_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketChange'})
+           stock['Change'] = change_tag.text if change_tag else 'N/A'
+
+           change_percent_tag = row.find('fin-streamer', attrs={'data-field': 'regularMarketChangePercent'})
+           stock['Change%'] = re.sub(r'^\(|\)$', '', change_percent_tag.text) if change_percent_tag else 'N/A'
+
+           data.append(stock)
+    return data
+
+def make_snapshot(data, refreshed_at):
+    edt_timezone = pytz.timezone('America/New_York')
+    return {
+        'data': data,
+        'retrievedAt': datetime.fromtimestamp(refreshed_at, edt_timezone).strftime('%A, %d %B %Y at %H:%M %Z'),
+        'refreshedAt': refreshed_at,
+    }
+
+def snapshot_path(category):
+    return os.path.join(SNAPSHOT_DIR, f"{category}.json")
+
+def load_snapshot(category):
+    try:
+        with open(snapshot_path(category), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_snapshot(category, snapshot):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_file = f"{snapshot_path(category)}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_file, snapshot_path(category))
+
+def load_backup(category):
+    backup_file = os.path.join(BACKUP_DIR, BACKUP_FILES[category])
+    if not os.path.exists(backup_file):
+        return None
+    with open(backup_file, 'r', encoding='utf-8') as f:
+        # Never fresh, so the next request retries the scrape
+        return make_snapshot(json.load(f), 0)
+
+def get_snapshot(category):
+    # Another worker process may have refreshed the shared snapshot on disk
+    with _lock:
+        snapshot = _snapshots.get(category)
+    on_disk = load_snapshot(category)
+    if on_disk and (snapshot is None or on_disk["refreshedAt"] > snapshot["refreshedAt"]):
+        with _lock:
+            _snapshots[category] = on_disk
+        return on_disk
+    return snapshot
+
+def is_stale(snapshot):
+    return time.time() - snapshot["refreshedAt"] >= STALE_AFTER
+
+def refresh_category(category):
+    snapshot = get_snapshot(category)
+    if snapshot and not is_stale(snapshot):
+        return snapshot
+
+    data = scrape_top_stocks(category)
+    if isinstance(data, dict):
+        print(f"Refreshing {category} failed: {data['error']}", file=sys.stderr)
+        return snapshot or data
+    if not data:
+        # Keep serving the last good scrape when Yahoo's markup changes under us
+        return snapshot or load_backup(category) or {"error": f"No backup data found.|{BACKUP_FILES[category]}| Please check the backup file."}
+
+    snapshot = make_snapshot(data, time.time())
+    with _lock:
+        _snapshots[category] = snapshot
+    with span("persist"):
+        save_snapshot(category, snapshot)
+    return snapshot
+
+def refresh_in_background(category):
+    with _lock:
+        if category in _refreshing:
+            return
+        _refreshing.add(category)
+
+    def run():
+        try:
+            refresh_category(category)
+        except Exception as e:
+            print(f"Refreshing {category} failed: {e}", file=sys.stderr)
+        finally:
+            with _lock:
+                _refreshing.discard(category)
+
+    # A daemon, so it never holds up shutdown; only used alongside start_refresher, which retries an unfinished refresh
+    threading.Thread(target=run, name=f"top-stocks-{category}", daemon=True).start()
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    global _refresher
+    # For long-lived processes: keeps every category warm so requests never wait on Yahoo.
+    # Every worker of a pool starts one, but only the holder of the lock file scrapes; the others serve the
+    # snapshots it writes and take over the lock if that process exits.
+    def run():
+        lock = None
+        while True:
+            lock = lock or try_lock(REFRESHER_LOCK_FILE)
+            if lock:
+                for category in CATEGORY_URLS:
+                    try:
+                        refresh_category(category)
+                    except Exception as e:
+                        print(f"Refreshing {category} failed: {e}", file=sys.stderr)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="top-stocks-refresher", daemon=True)
+    thread.start()
+    _refresher = thread
+    return thread
+
+def get_top_stocks(category="most-active"):
+    if category not in CATEGORY_URLS:
+       return {"error": f"Invalid category: {category}. Valid categories are: {', '.join(CATEGORY_URLS.keys())}"}
+
+    snapshot = get_snapshot(category)
+    if snapshot is not None and is_stale(snapshot) and _refresher is not None:
+        refresh_in_background(category)
+    elif snapshot is None or is_stale(snapshot):
+        # A one-shot CLI or Lambda run exits before a background refresh could finish, so refresh here
+        snapshot = refresh_category(category)
+        if "error" in snapshot:
+            return snapshot
+
+    stocks_data = {}
+    stocks_data['data'] = snapshot['data']
+    stocks_data['retrievedAt'] = snapshot['retrievedAt']
+    stocks_data['ageSeconds'] = int(time.time() - snapshot['refreshedAt']) if snapshot['refreshedAt'] else None
+    stocks_data['stale'] = is_stale(snapshot)
+    return stocks_data
+
 def lambda_handler(event, context):
     category = event.get('queryStringParameters', {}).get('category', 'most-active')
     stocks = get_top_stocks(category)
-   
+
     return stocks
 
 if __name__ == "__main__":
    category = sys.argv[1]
    top_stocks = get_top_stocks(category)
-   print(json.dumps(top_stocks, indent=4))
\ No newline at end of file
+   print(json.dumps(top_stocks, indent=4), flush=True)
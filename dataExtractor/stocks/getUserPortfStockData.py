@@ -1,6 +1,16 @@
 import yfinance as yf
+import pandas as pd
 import sys
 import json
+import os
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+COMPANIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sp500', 'sp500_companies.csv')
+NAME_LOOKUP_WORKERS = 8
+
+# Company names survive across warm invocations; prices are always fetched fresh
+_company_names = {}
 
 def get_stock_data(stock_symbol):
     stock = yf.Ticker(stock_symbol)
@@ -14,6 +24,81 @@ def get_stock_data(stock_symbol):
 
     return stock_data
 
+def load_company_names():
+    if _company_names or not os.path.exists(COMPANIES_FILE):
+        return
+    with open(COMPANIES_FILE, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row.get('Longname'):
+                _company_names[row['Symbol']] = row['Longname']
+
+def fetch_company_name(stock_symbol):
+    try:
+        return yf.Ticker(stock_symbol).info.get('longName', "Not found")
+    except Exception:
+        return "Not found"
+
+def get_company_names(stock_symbols):
+    load_company_names()
+    missing = [symbol for symbol in stock_symbols if symbol not in _company_names]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(NAME_LOOKUP_WORKERS, len(missing))) as executor:
+            names = executor.map(fetch_company_name, missing)
+            for symbol, name in zip(missing, names):
+                _company_names[symbol] = name
+    return {symbol: _company_names[symbol] for symbol in stock_symbols}
+
+def get_close_prices(prices, stock_symbol):
+    if isinstance(prices.columns, pd.MultiIndex):
+        if stock_symbol not in prices.columns.get_level_values(0):
+            return None
+        prices = prices[stock_symbol]
+    return prices['Close'].dropna()
+
+def to_ticker(stock_symbol):
+    # yf.download upper-cases tickers in its columns; None for anything that cannot be a ticker
+    if not isinstance(stock_symbol, str) or not stock_symbol.strip():
+        return None
+    return stock_symbol.strip().upper()
+
+def invalid_symbol_error(stock_symbol):
+    return {"error": f"Invalid stock symbol: {stock_symbol!r}"}
+
+def get_stock_quotes(stock_symbols):
+    # One bulk download for every valid symbol; the last two daily closes give the current price and the previous close.
+    # Quotes are keyed by the symbol the caller sent; invalid symbols get their own error and stay out of the batch.
+    quotes = {}
+    tickers = {}
+    for stock_symbol in stock_symbols:
+        ticker = to_ticker(stock_symbol)
+        if ticker is None:
+            if isinstance(stock_symbol, str):
+                quotes[stock_symbol] = invalid_symbol_error(stock_symbol)
+            continue
+        tickers[stock_symbol] = ticker
+    if not tickers:
+        return quotes
+    unique_tickers = list(dict.fromkeys(tickers.values()))
+
+    prices = yf.download(unique_tickers, period="5d", interval="1d", group_by="ticker", auto_adjust=False, progress=False, threads=True)
+    company_names = get_company_names(unique_tickers)
+
+    for stock_symbol, ticker in tickers.items():
+        closes = get_close_prices(prices, ticker) if prices is not None and not prices.empty else None
+        if closes is None or len(closes) < 2:
+            quotes[stock_symbol] = {"error": f"No price data found for {stock_symbol}"}
+            continue
+
+        current_price = round(float(closes.iloc[-1]), 4)
+        previous_close = float(closes.iloc[-2])
+        quotes[stock_symbol] = {
+            'companyName': company_names[ticker],
+            'currentPrice': current_price,
+            'change': f"{current_price - previous_close:.2f}",
+            'change%': f"{((current_price / previous_close) - 1.00) * 100:.2f}",
+        }
+    return quotes
+
 def lambda_handler(event, context):
     items = event.get("Items", [])
     
@@ -25,35 +110,47 @@ def lambda_handler(event, context):
             })
         }
 
-    portfolios_stock_data = {}
+    portfolios = []
 
     for item in items:
         portfolio_name = item.get("portfolioName", "N/A")
         stock_symbols  = item.get("stock", [])
+        portfolios.append((portfolio_name, stock_symbols if isinstance(stock_symbols, list) else None))
+
+    # A symbol held in several portfolios is fetched once
+    all_symbols = [symbol for _, stock_symbols in portfolios for symbol in stock_symbols or []]
+    try:
+        quotes = get_stock_quotes(all_symbols)
+    except Exception as e:
+        quotes = {symbol: {"error": str(e)} for symbol in all_symbols if to_ticker(symbol) is not None}
+
+    portfolios_stock_data = {}
 
-        if not isinstance(stock_symbols, list):
+    for portfolio_name, stock_symbols in portfolios:
+        if stock_symbols is None:
             portfolios_stock_data[portfolio_name] = {
                 "error": f"Invalid stock list for portfolio '{portfolio_name}'"
             }
             continue
-        
+
         portfolio_stock_data = []
 
         for stock_symbol in stock_symbols:
-            try:
-                stock_data = get_stock_data(stock_symbol)
-                portfolio_stock_data.append({
-                    "Symbol": stock_symbol,
-                    "Company Name": stock_data.get("companyName"),
-                    "Price": stock_data.get("currentPrice"),
-                    "Change": stock_data.get("change"),
-                    "Change%": stock_data.get("change%")
-                })
-            except Exception as e:
+            stock_data = quotes[stock_symbol] if to_ticker(stock_symbol) is not None else invalid_symbol_error(stock_symbol)
+            if "error" in stock_data:
                 portfolio_stock_data.append({
                     "stockSymbol": stock_symbol,
-                    "error": str(e)
+                    "error": stock_data["error"]
                 })
+                continue
+
+            portfolio_stock_data.append({
+                "Symbol": stock_symbol,
+                "Company Name": stock_data.get("companyName"),
+                "Price": stock_data.get("currentPrice"),
+                "Change": stock_data.get("change"),
+                "Change%": stock_data.get("change%")
+            })
 
         portfolios_stock_data[portfolio_name] = portfolio_stock_data
 
@@ -64,7 +161,5 @@ def lambda_handler(event, context):
 
 if __name__ == "__main__":
     stock_symbols = sys.argv[1:]
-    all_stock_data = {}
-    for stock_symbol in stock_symbols:
-        all_stock_data[stock_symbol] = get_stock_data(stock_symbol)
+    all_stock_data = get_stock_quotes(stock_symbols)
     print(json.dumps(all_stock_data))
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+# One row per symbol. Histories are plain lists: EPS and yearly dividends oldest first, PE ratios newest first.
+# A history is None when its page could not be scraped, which fails every criterion that needs it.
+UNIVERSE_COLUMNS = ["symbol", "company_name", "total_revenue", "current_ratio", "price_to_book", "eps", "dividends", "pe_ratios"]
+OUTPUT_COLUMNS = ["Stock Symbol", "Company Name", "Defensive Value", "Defensive", "Enterprising Value", "Enterprising", "Overall Value"]
+
+EPS_WINDOW = 10
+DIVIDEND_WINDOW = 20
+PE_WINDOW = 3
+
+def to_floats(column):
+    return np.array([np.nan if value is None else float(value) for value in column], dtype=float)
+
+def history_matrix(histories, width, newest_first=False):
+    # The `width` most recent values of each history in a NaN-padded matrix, plus each history's full length.
+    # Oldest-first histories are right-aligned so the newest value is always the last column.
+    matrix = np.full((len(histories), width), np.nan)
+    lengths = np.zeros(len(histories), dtype=int)
+    for row, history in enumerate(histories):
+        if not history:
+            continue
+        lengths[row] = len(history)
+        if newest_first:
+            recent = history[:width]
+            matrix[row, :len(recent)] = recent
+        else:
+            recent = history[-width:]
+            matrix[row, width - len(recent):] = recent
+    return matrix, lengths
+
+def all_recent(matrix, lengths, window, passes):
+    # all() over the last `window` entries of each history, True for an empty one like Python's all()
+    in_window = np.arange(matrix.shape[1]) >= matrix.shape[1] - np.minimum(lengths, window)[:, None]
+    return np.where(in_window, passes(matrix), True).all(axis=1)
+
+def running_sum(columns):
+    # Adds left to right from 0 like Python's sum(), so threshold comparisons see the same floats
+    total = np.zeros(columns.shape[0])
+    for column in columns.T:
+        total = total + column
+    return total
+
+def round_values(values, digits):
+    # Python's round() is correctly rounded and np.round is not; the rules must flip at the same values as before
+    return np.array([round(value, digits) for value in values.tolist()], dtype=float)
+
+def build_universe(rows):
+    # object dtype keeps a missing company name as None instead of NaN
+    return pd.DataFrame(rows, columns=UNIVERSE_COLUMNS, dtype=object)
+
+def build_features(universe):
+    eps_histories = universe["eps"].tolist()
+    pe_histories = universe["pe_ratios"].tolist()
+    eps, eps_length = history_matrix(eps_histories, EPS_WINDOW)
+    dividends, dividend_length = history_matrix(universe["dividends"].tolist(), DIVIDEND_WINDOW)
+    pe_ratios, pe_length = history_matrix(pe_histories, PE_WINDOW, newest_first=True)
+    return {
+        "revenue": to_floats(universe["total_revenue"]),
+        "current_ratio": to_floats(universe["current_ratio"]),
+        "price_to_book": to_floats(universe["price_to_book"]),
+        "has_eps": np.array([history is not None for history in eps_histories]),
+        "eps": eps,
+        "eps_length": eps_length,
+        "eps_first": np.array([history[0] if history else np.nan for history in eps_histories], dtype=float),
+        "dividends": dividends,
+        "dividend_length": dividend_length,
+        "has_pe": np.array([history is not None for history in pe_histories]),
+        "pe_ratios": pe_ratios,
+        "pe_length": pe_length,
+    }
+
+def earnings_growth(features):
+    # Average of the last three years against the three years a decade back
+    eps = features["eps"]
+    earlier, recent = running_sum(eps[:, :3]), running_sum(eps[:, -3:])
+    return (features["eps_length"] >= 10) & (earlier > 0) & ((recent / 3) / (earlier / 3) >= 4.0 / 3)
+
+def price_to_assets(features):
+    return round_values(features["pe_ratios"][:, 0] * features["price_to_book"], 2)
+
+def within(limit):
+    def passes(features):
+        value = price_to_assets(features)
+        return features["has_pe"] & (features["pe_length"] > 0) & (value != 0) & (value <= limit)
+    return passes
+
+# Graham's seven criteria in bitstring order: (criterion, defensive test, enterprising test).
+# Every test maps the feature arrays of the whole universe to one bool per symbol.
+RULES = [
+    ("total revenue",
+        lambda f: f["revenue"] >= 100000000,
+        lambda f: f["revenue"] > 0),
+    ("current ratio",
+        lambda f: f["current_ratio"] >= 2,
+        lambda f: f["current_ratio"] >= 1.5),
+    ("positive EPS",
+        lambda f: f["has_eps"] & all_recent(f["eps"], f["eps_length"], 10, lambda eps: eps >= 0),
+        lambda f: f["has_eps"] & all_recent(f["eps"], f["eps_length"], 5, lambda eps: eps >= 0)),
+    ("dividend record",
+        lambda f: all_recent(f["dividends"], f["dividend_length"], 20, lambda dividends: dividends > 0),
+        lambda f: (f["dividend_length"] > 0) & (f["dividends"][:, -1] > 0)),
+    ("earnings growth",
+        lambda f: f["has_eps"] & earnings_growth(f),
+        lambda f: f["has_eps"] & (f["eps_length"] > 0) & (f["eps_first"] > 0) & (f["eps"][:, -1] / f["eps_first"] >= 1.0)),
+    ("PE ratio",
+        lambda f: f["has_pe"] & (f["pe_length"] > 3) & (round_values(running_sum(f["pe_ratios"]) / 3, 2) <= 15),
+        lambda f: np.ones(len(f["revenue"]), dtype=bool)),
+    ("price to assets",
+        within(22.5),
+        within(18)),
+]
+
+def bitstrings(bits):
+    codes = np.ascontiguousarray(bits.astype(np.uint8) + ord("0"))
+    return codes.view(f"S{bits.shape[1]}").ravel().astype(str)
+
+def score_universe(universe):
+    features = build_features(universe)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        defensive = np.column_stack([defensive_rule(features) for _, defensive_rule, _ in RULES])
+        enterprising = np.column_stack([enterprising_rule(features) for _, _, enterprising_rule in RULES])
+
+    defensive_value = defensive.sum(axis=1)
+    enterprising_value = enterprising.sum(axis=1)
+    return pd.DataFrame({
+        "Stock Symbol": universe["symbol"].to_numpy(),
+        "Company Name": pd.Series(universe["company_name"].to_numpy(), dtype=object),
+        "Defensive Value": defensive_value,
+        "Defensive": bitstrings(defensive),
+        "Enterprising Value": enterprising_value,
+        "Enterprising": bitstrings(enterprising),
+        "Overall Value": defensive_value + enterprising_value,
+    }, columns=OUTPUT_COLUMNS)
+
+def score_records(universe):
+    # JSON-ready rows with plain Python values, in the shape the per-symbol function has always returned
+    scored = score_universe(universe)
+    return [
+        {
+            "Stock Symbol": symbol,
+            "Company Name": company_name,
+            "Defensive Value": int(defensive_value),
+            "Defensive": defensive,
+            "Enterprising Value": int(enterprising_value),
+            "Enterprising": enterprising,
+            "Overall Value": int(overall_value),
+        }
+        for symbol, company_name, defensive_value, defensive, enterprising_value, enterprising, overall_value in zip(*(scored[column].tolist() for column in OUTPUT_COLUMNS))
+    ]
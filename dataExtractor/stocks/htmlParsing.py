@@ -0,0 +1,97 @@
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+
+# "lxml-stream" feeds the page to lxml's pull parser and stops at the end of the target element.
+# "lxml" and "html.parser" build a BeautifulSoup tree restricted to the target element only.
+BACKENDS = ("lxml-stream", "lxml", "html.parser")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Parsers are imported on first use; a cached scrape never needs them
+HAS_LXML = find_spec("lxml") is not None
+
+@lru_cache(maxsize=None)
+def get_etree():
+    from lxml import etree
+    return etree
+
+def get_default_backend():
+    backend = os.getenv("HTML_PARSER_BACKEND")
+    if backend in BACKENDS:
+        return backend
+    return "lxml-stream" if HAS_LXML else "html.parser"
+
+def resolve_backend(backend):
+    backend = backend or get_default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}. Valid backends are: {', '.join(BACKENDS)}")
+    if backend.startswith("lxml") and not HAS_LXML:
+        return "html.parser"
+    return backend
+
+def has_class(class_attr, class_name):
+    return class_name in (class_attr or "").split()
+
+def class_matcher(class_name):
+    # Attribute values are not always split into lists while a SoupStrainer filters the parse
+    def matches(value):
+        values = value if isinstance(value, list) else (value or "").split()
+        return class_name in values
+    return matches
+
+def element_text(element):
+    return "".join(element.itertext())
+
+def stream_find(content, tag, class_name):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    parser = get_etree().HTMLPullParser(events=("end",), tag=tag)
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        parser.feed(content[start:start + STREAM_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if has_class(element.get("class"), class_name):
+                return element
+    parser.close()
+    for _, element in parser.read_events():
+        if has_class(element.get("class"), class_name):
+            return element
+    return None
+
+def make_soup(content, tag, attrs, backend):
+    from bs4 import BeautifulSoup, SoupStrainer
+    parser = "lxml" if backend.startswith("lxml") else "html.parser"
+    return BeautifulSoup(content, parser, parse_only=SoupStrainer(tag, attrs=attrs))
+
+def find_table_rows(content, class_name, backend=None):
+    # Cell texts of every <tbody> row in the first table with the given class, or None when the
+    # table (or its tbody) is missing.
+    backend = resolve_backend(backend)
+    if backend == "lxml-stream":
+        table = stream_find(content, "table", class_name)
+        if table is None:
+            return None
+        tbody = next(table.iter("tbody"), None)
+        if tbody is None:
+            return None
+        return [[element_text(cell) for cell in row.iter("td")] for row in tbody.iter("tr")]
+
+    soup = make_soup(content, "table", {"class": class_matcher(class_name)}, backend)
+    table = soup.find("table", class_=class_name)
+    if table is None or table.find("tbody") is None:
+        return None
+    return [[cell.text for cell in row.find_all("td")] for row in table.find("tbody").find_all("tr")]
+
+def find_element_text(content, tag, class_name, backend=None):
+    backend = resolve_backend(backend)
+    if backend == "lxml-stream":
+        element = stream_find(content, tag, class_name)
+        return element_text(element) if element is not None else None
+
+    element = make_soup(content, tag, {"class": class_matcher(class_name)}, backend).find(tag, class_=class_name)
+    return element.text if element is not None else None
+
+def find_element(content, tag, attrs, backend=None):
+    # BeautifulSoup element for callers that need to walk nested markup; only the matching
+    # subtree is built, with lxml when it is available.
+    backend = resolve_backend(backend)
+    return make_soup(content, tag, attrs, backend).find(tag, attrs=attrs)
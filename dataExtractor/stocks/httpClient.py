@@ -0,0 +1,68 @@
+import os
+import random
+import threading
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux aarch64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 CrKey/1.54.250320",
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Mobile Safari/537.36",
+]
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 20))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+
+# 429 and 503 are left to the per-domain backoff in rateLimiter so every thread hitting that host slows down together.
+RETRY_STATUS_CODES = (500, 502, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+def random_user_agent():
+    return random.choice(USER_AGENTS)
+
+def make_retry(max_retries=MAX_RETRIES):
+    from urllib3.util.retry import Retry
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+def create_session(max_retries=MAX_RETRIES, pool_maxsize=POOL_MAXSIZE):
+    # urllib3 keeps one keep-alive pool per host, each holding up to pool_maxsize sockets for the worker threads.
+    # requests is imported on the first real request, so runs answered from the caches never load it.
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=make_retry(max_retries))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+def http_get(url, headers=None, timeout=None, **kwargs):
+    request_headers = {"User-Agent": random_user_agent()}
+    request_headers.update(headers or {})
+    return get_session().get(url, headers=request_headers, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs)
@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+import time
+from getAaaCorporateBondYield import get_aaa_corporate_bond_yield
+from cacheDir import CACHE_DIR
+from metrics import record_cache
+from getCostOfEquity import RISK_FREE_RATE as DEFAULT_RISK_FREE_RATE, EXPECTED_MARKET_RETURN as DEFAULT_EXPECTED_MARKET_RETURN
+
+DEFAULT_TTL = 24 * 60 * 60
+RISK_FREE_RATE_SYMBOL = "^TNX"
+
+CACHE_FILE = os.path.join(CACHE_DIR, "macroInputs.json")
+
+_memory_cache = {}
+
+def parse_percentage(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float(str(value).strip().rstrip('%').replace(',', ''))
+
+def fetch_aaa_corporate_bond_yield():
+    response = get_aaa_corporate_bond_yield()
+    if 'aaaCorporateBondYield' not in response:
+        raise ValueError(response.get('error', 'Failed to retrieve AAA corporate bond yield'))
+    return parse_percentage(response['aaaCorporateBondYield'])
+
+def fetch_risk_free_rate():
+    import yfinance as yf
+    closes = yf.Ticker(RISK_FREE_RATE_SYMBOL).history(period="5d")["Close"].dropna()
+    return round(float(closes.iloc[-1]) / 100, 6)
+
+def use_live_risk_free_rate():
+    return os.getenv("USE_LIVE_RISK_FREE_RATE", "").lower() in ("1", "true", "yes")
+
+def read_cache_file(cache_file):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+def write_cache_entry(cache_file, name, entry):
+    # Each input has its own entry, so refreshing one never needs the others to be reachable
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    entries = read_cache_file(cache_file)
+    entries[name] = entry
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=4)
+    os.replace(tmp_file, cache_file)
+
+def read_cache_entry(cache_file, name):
+    # Files written before inputs were cached separately hold bare values; treat those as missing
+    entry = read_cache_file(cache_file).get(name)
+    return entry if isinstance(entry, dict) and "value" in entry else None
+
+def is_fresh(entry, ttl):
+    return entry is not None and time.time() - entry.get("fetchedAt", 0) < ttl
+
+def get_cached_input(name, fetch, ttl=DEFAULT_TTL, cache_file=CACHE_FILE):
+    loaded_at, cached = _memory_cache.get((cache_file, name), (0, None))
+    if cached is not None and time.time() - loaded_at < ttl:
+        record_cache("macroInputs", True)
+        return cached["value"]
+
+    cached = read_cache_entry(cache_file, name)
+    if is_fresh(cached, ttl):
+        record_cache("macroInputs", True)
+        _memory_cache[(cache_file, name)] = (cached["fetchedAt"], cached)
+        return cached["value"]
+
+    record_cache("macroInputs", False)
+
+    try:
+        entry = {"value": fetch(), "fetchedAt": time.time()}
+    except Exception:
+        if cached is None:
+            raise
+        # A stale value is a better input than none at all when its source is unavailable
+        print(f"Using stale {name} from cache", file=sys.stderr)
+        entry = cached
+    else:
+        write_cache_entry(cache_file, name, entry)
+
+    _memory_cache[(cache_file, name)] = (time.time(), entry)
+    return entry["value"]
+
+def get_aaa_yield(ttl=DEFAULT_TTL, cache_file=CACHE_FILE):
+    return get_cached_input("aaaCorporateBondYield", fetch_aaa_corporate_bond_yield, ttl, cache_file)
+
+def get_risk_free_rate(ttl=DEFAULT_TTL, cache_file=CACHE_FILE):
+    if os.getenv("RISK_FREE_RATE"):
+        return float(os.environ["RISK_FREE_RATE"])
+    if not use_live_risk_free_rate():
+        return DEFAULT_RISK_FREE_RATE
+    try:
+        return get_cached_input("riskFreeRate", fetch_risk_free_rate, ttl, cache_file)
+    except Exception as e:
+        # Not cached on purpose, so the next call retries the live rate
+        print(f"Falling back to default risk-free rate: {e}", file=sys.stderr)
+        return DEFAULT_RISK_FREE_RATE
+
+def get_expected_market_return():
+    return float(os.getenv("EXPECTED_MARKET_RETURN", DEFAULT_EXPECTED_MARKET_RETURN))
+
+def get_rate_inputs(ttl=DEFAULT_TTL, cache_file=CACHE_FILE):
+    # Everything the DCF and DDM cost of equity needs; never touches ycharts
+    return {
+        "riskFreeRate": get_risk_free_rate(ttl, cache_file),
+        "expectedMarketReturn": get_expected_market_return(),
+    }
+
+def get_macro_inputs(ttl=DEFAULT_TTL, cache_file=CACHE_FILE):
+    macro_inputs = get_rate_inputs(ttl, cache_file)
+    macro_inputs["aaaCorporateBondYield"] = get_aaa_yield(ttl, cache_file)
+    return macro_inputs
+
+def lambda_handler(event, context):
+    macro_inputs = get_macro_inputs()
+    return json.dumps(macro_inputs, indent=4)
+
+if __name__ == "__main__":
+    macro_inputs = get_macro_inputs()
+    print(json.dumps(macro_inputs, indent=4))
@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, Prometheus-style; the last bucket catches everything
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf"))
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+class MetricsRegistry:
+    # Spans record self time: a nested span's duration is subtracted from its parent, so the stage
+    # totals of a run add up to the instrumented wall time instead of counting fetches twice.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.stages = {}
+            self.hosts = {}
+            self.caches = {}
+            self.symbols = {}
+
+    def _stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+            self.local.symbol = None
+        return self.local.stack
+
+    @contextmanager
+    def symbol_scope(self, symbol):
+        self._stack()
+        previous, self.local.symbol = self.local.symbol, symbol
+        try:
+            yield
+        finally:
+            self.local.symbol = previous
+
+    @contextmanager
+    def span(self, stage, host=None):
+        stack = self._stack()
+        frame = [0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            self.observe(stage, elapsed - frame[0], host, self.local.symbol)
+
+    def observe(self, stage, seconds, host=None, symbol=None):
+        with self.lock:
+            key = (stage, host or "")
+            if key not in self.stages:
+                self.stages[key] = Histogram()
+            self.stages[key].observe(seconds)
+            if symbol:
+                totals = self.symbols.setdefault(symbol, {})
+                totals[stage] = totals.get(stage, 0.0) + seconds
+
+    def record_response(self, host, status_code, size):
+        with self.lock:
+            stats = self.hosts.setdefault(host or "", {"bytes": 0, "statuses": {}})
+            stats["bytes"] += size
+            stats["statuses"][str(status_code)] = stats["statuses"].get(str(status_code), 0) + 1
+
+    def record_cache(self, cache, hit):
+        with self.lock:
+            stats = self.caches.setdefault(cache, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def to_records(self):
+        with self.lock:
+            records = [{"type": "run", "startedAt": self.started_at, "wallSeconds": round(time.time() - self.started_at, 6)}]
+            for (stage, host), histogram in sorted(self.stages.items()):
+                records.append({
+                    "type": "stage",
+                    "stage": stage,
+                    "host": host or None,
+                    "count": histogram.count,
+                    "seconds": round(histogram.sum, 6),
+                    "buckets": {("+Inf" if bound == float("inf") else str(bound)): total for bound, total in histogram.cumulative()},
+                })
+            for host, stats in sorted(self.hosts.items()):
+                records.append({"type": "host", "host": host, "requests": sum(stats["statuses"].values()), "bytes": stats["bytes"], "statuses": dict(stats["statuses"])})
+            for cache, stats in sorted(self.caches.items()):
+                lookups = stats["hits"] + stats["misses"]
+                records.append({"type": "cache", "cache": cache, "hits": stats["hits"], "misses": stats["misses"], "hitRate": round(stats["hits"] / lookups, 4) if lookups else None})
+            for symbol, totals in sorted(self.symbols.items()):
+                records.append({"type": "symbol", "symbol": symbol, "seconds": {stage: round(seconds, 6) for stage, seconds in totals.items()}, "totalSeconds": round(sum(totals.values()), 6)})
+            return records
+
+    def to_prometheus(self):
+        records = self.to_records()
+        lines = [
+            "# HELP extractor_run_seconds Wall time since the metrics were reset",
+            "# TYPE extractor_run_seconds gauge",
+            f"extractor_run_seconds {records[0]['wallSeconds']}",
+            "# HELP extractor_stage_seconds Self time spent in each pipeline stage",
+            "# TYPE extractor_stage_seconds histogram",
+        ]
+        for record in records:
+            if record["type"] != "stage":
+                continue
+            labels = {"stage": record["stage"]}
+            if record["host"]:
+                labels["host"] = record["host"]
+            for bound, total in record["buckets"].items():
+                lines.append(f"extractor_stage_seconds_bucket{format_labels(dict(labels, le=bound))} {total}")
+            lines.append(f"extractor_stage_seconds_sum{format_labels(labels)} {record['seconds']}")
+            lines.append(f"extractor_stage_seconds_count{format_labels(labels)} {record['count']}")
+
+        lines += ["# HELP extractor_http_responses_total HTTP responses by host and status code", "# TYPE extractor_http_responses_total counter"]
+        for record in records:
+            if record["type"] == "host":
+                for status, count in sorted(record["statuses"].items()):
+                    lines.append(f"extractor_http_responses_total{format_labels({'host': record['host'], 'status': status})} {count}")
+        lines += ["# HELP extractor_http_bytes_total Response body bytes received by host", "# TYPE extractor_http_bytes_total counter"]
+        for record in records:
+            if record["type"] == "host":
+                lines.append(f"extractor_http_bytes_total{format_labels({'host': record['host']})} {record['bytes']}")
+
+        lines += ["# HELP extractor_cache_lookups_total Cache lookups by cache and result", "# TYPE extractor_cache_lookups_total counter"]
+        for record in records:
+            if record["type"] == "cache":
+                lines.append(f"extractor_cache_lookups_total{format_labels({'cache': record['cache'], 'result': 'hit'})} {record['hits']}")
+                lines.append(f"extractor_cache_lookups_total{format_labels({'cache': record['cache'], 'result': 'miss'})} {record['misses']}")
+
+        lines += ["# HELP extractor_symbol_seconds Self time per symbol and stage", "# TYPE extractor_symbol_seconds gauge"]
+        for record in records:
+            if record["type"] == "symbol":
+                for stage, seconds in sorted(record["seconds"].items()):
+                    lines.append(f"extractor_symbol_seconds{format_labels({'symbol': record['symbol'], 'stage': stage})} {seconds}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path_prefix):
+        # Writes <prefix>.metrics.jsonl and <prefix>.prom and returns their paths
+        jsonl_path, prometheus_path = f"{path_prefix}.metrics.jsonl", f"{path_prefix}.prom"
+        directory = os.path.dirname(os.path.abspath(jsonl_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for record in self.to_records():
+                f.write(json.dumps(record) + "\n")
+        with open(prometheus_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return jsonl_path, prometheus_path
+
+def format_labels(labels):
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+_registry = MetricsRegistry()
+
+def get_registry():
+    return _registry
+
+def span(stage, host=None):
+    return _registry.span(stage, host)
+
+def symbol_scope(symbol):
+    return _registry.symbol_scope(symbol)
+
+def record_response(host, status_code, size):
+    _registry.record_response(host, status_code, size)
+
+def record_cache(cache, hit):
+    _registry.record_cache(cache, hit)
+
+def write_metrics(path_prefix):
+    return _registry.write(path_prefix)
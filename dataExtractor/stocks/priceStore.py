@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import threading
+import time
+import numpy as np
+import pandas as pd
+from cacheDir import CACHE_DIR
+from metrics import record_cache
+
+# One float64 row per column, so each column is contiguous on disk and a memory-mapped read touches only what it slices.
+# Timestamps are epoch seconds, which float64 holds exactly.
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+CLOSE_ROW = 1 + COLUMNS.index("Close")
+DEFAULT_TIMEZONE = "America/New_York"
+MIN_REFRESH_SECONDS = int(os.getenv("PRICE_STORE_REFRESH_SECONDS", 300))
+
+def range_start(range_param, now):
+    # Earliest wall-clock time a calendar range needs; None for ranges counted in trading days ("1d", "5d")
+    if range_param == "max":
+        return -np.inf
+    if range_param == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz=now.tz).timestamp()
+    match = re.fullmatch(r"(\d+)(mo|y)", range_param)
+    if match:
+        count, unit = int(match.group(1)), match.group(2)
+        offset = pd.DateOffset(months=count) if unit == "mo" else pd.DateOffset(years=count)
+        return (now - offset).timestamp()
+    return None
+
+def trading_days(range_param):
+    match = re.fullmatch(r"(\d+)d", range_param)
+    return int(match.group(1)) if match else None
+
+def slice_start(timestamps, range_param, timezone, needed_start):
+    # Position of the first stored bar a range covers
+    days = trading_days(range_param)
+    if days is None:
+        return int(np.searchsorted(timestamps, needed_start))
+    # Trading-day ranges start at the first bar of the Nth most recent session in the exchange timezone
+    dates = pd.to_datetime(np.array(timestamps, dtype=np.int64), unit="s", utc=True).tz_convert(timezone).normalize()
+    unique_dates = dates.unique()
+    # Compare as timestamps: asi8 follows the index resolution, which is not always nanoseconds
+    return int(dates.searchsorted(unique_dates[-days])) if len(unique_dates) > days else 0
+
+class PriceStore:
+    # Per-symbol, per-interval bar history on local disk. Requests are served by slicing the stored columns;
+    # upstream is only asked for bars after the last stored one, or for the full period when the store does
+    # not reach back far enough yet. `retention` maps an interval to the longest range served from it; older
+    # bars of those intervals are dropped on every write so intraday stores do not grow without bound.
+    def __init__(self, root=os.path.join(CACHE_DIR, "prices"), min_refresh=MIN_REFRESH_SECONDS, retention=None):
+        self.root = root
+        self.min_refresh = min_refresh
+        self.retention = retention or {}
+        # One lock per (symbol, interval), so a slow fetch only holds up requests for the same series;
+        # self.lock only guards the map of locks
+        self.lock = threading.Lock()
+        self.series_locks = {}
+
+    def _series_lock(self, stock_symbol, interval):
+        key = (stock_symbol.upper(), interval)
+        with self.lock:
+            if key not in self.series_locks:
+                self.series_locks[key] = threading.Lock()
+            return self.series_locks[key]
+
+    def _paths(self, stock_symbol, interval):
+        base = os.path.join(self.root, stock_symbol.upper(), interval)
+        return base + ".npy", base + ".json"
+
+    def load(self, stock_symbol, interval):
+        data_path, meta_path = self._paths(stock_symbol, interval)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stored = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None, None
+        # The meta is written after the data, so a crash between the two leaves a meta that does not describe the
+        # data beside it; refetch rather than trust coverage that may not be there
+        if not self._describes(meta, stored):
+            return None, None
+        return meta, stored
+
+    def _describes(self, meta, stored):
+        if stored.ndim != 2 or stored.shape[0] != len(COLUMNS) + 1 or meta.get("rows") != stored.shape[1]:
+            return False
+        return stored.shape[1] == 0 or meta.get("lastTimestamp") == float(stored[0, -1])
+
+    def _write(self, stock_symbol, interval, meta, columns):
+        data_path, meta_path = self._paths(stock_symbol, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(data_path + suffix, 'wb') as f:
+            np.save(f, columns)
+        os.replace(data_path + suffix, data_path)
+        meta = dict(meta, rows=columns.shape[1], lastTimestamp=float(columns[0, -1]) if columns.shape[1] else None)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+    def _to_columns(self, history):
+        index = history.index.tz_convert("UTC") if history.index.tz is not None else history.index
+        rows = [index.tz_localize(None).values.astype("datetime64[s]").astype(np.int64)]
+        for column in COLUMNS:
+            rows.append(history[column].to_numpy(dtype=float) if column in history else np.full(len(history), np.nan))
+        return np.vstack(rows).astype(float)
+
+    def _merge(self, stored, fetched):
+        # Bars inside the fetched window are replaced, so a still-forming last bar is overwritten with its final values
+        if stored is None or stored.shape[1] == 0:
+            return fetched
+        if fetched.shape[1] == 0:
+            return np.array(stored)
+        timestamps = stored[0]
+        keep = (timestamps < fetched[0, 0]) | (timestamps > fetched[0, -1])
+        merged = np.hstack([stored[:, keep], fetched])
+        return merged[:, np.argsort(merged[0], kind="stable")]
+
+    def _refresh(self, stock, stock_symbol, range_param, interval, meta, stored, needed_start):
+        history = None
+        if meta is not None and (needed_start is None or needed_start >= meta["coverageStart"]):
+            if time.time() - meta["fetchedAt"] < self.min_refresh:
+                record_cache("priceStore", True)
+                return meta, stored
+            history = self._fetch_delta(stock, interval, stored)
+            coverage_start = meta["coverageStart"]
+            base = stored
+        if history is None:
+            # Cold or too short a store, or upstream re-adjusted the series (a split or dividend) so every stored
+            # bar is on a stale basis: refetch the period and replace the stored bars instead of merging into them
+            history = stock.history(period=range_param, interval=interval)
+            coverage_start = needed_start
+            base = None
+
+        record_cache("priceStore", False)
+        if history is None or history.empty:
+            return meta, stored
+
+        fetched = self._to_columns(history)
+        if coverage_start is None:
+            coverage_start = float(fetched[0, 0])
+        if base is not None:
+            coverage_start = min(coverage_start, meta["coverageStart"])
+        timezone = str(history.index.tz) if history.index.tz is not None else (meta or {}).get("timezone", DEFAULT_TIMEZONE)
+        columns = self._merge(base, fetched)
+        if interval in self.retention:
+            columns, coverage_start = self._trim(columns, coverage_start, self.retention[interval], timezone)
+        meta = {"timezone": timezone, "coverageStart": coverage_start, "fetchedAt": time.time()}
+        self._write(stock_symbol, interval, meta, columns)
+        return meta, columns
+
+    def _fetch_delta(self, stock, interval, stored):
+        # Bars from the last complete stored bar on, or None when that bar no longer matches upstream.
+        # The newest stored bar may still have been forming, so the one before it is the reference.
+        if stored.shape[1] < 2:
+            return None
+        reference, close = stored[0, -2], stored[CLOSE_ROW, -2]
+        history = stock.history(start=pd.Timestamp(reference, unit="s", tz="UTC"), interval=interval)
+        if history is None or history.empty:
+            return history
+        fetched = self._to_columns(history)
+        match = np.flatnonzero(fetched[0] == reference)
+        if not match.size or not np.isclose(fetched[CLOSE_ROW, match[0]], close, rtol=1e-6, equal_nan=True):
+            return None
+        return history
+
+    def _trim(self, columns, coverage_start, range_param, timezone):
+        start = slice_start(columns[0], range_param, timezone, range_start(range_param, pd.Timestamp.now(tz=timezone)))
+        if start == 0 or start >= columns.shape[1]:
+            return columns, coverage_start
+        return np.ascontiguousarray(columns[:, start:]), max(coverage_start, float(columns[0, start]))
+
+    def get_history(self, stock, stock_symbol, range_param, interval):
+        # Same frame shape as stock.history(period=range_param, interval=interval), indexed in the exchange timezone
+        with self._series_lock(stock_symbol, interval):
+            meta, stored = self.load(stock_symbol, interval)
+            timezone = (meta or {}).get("timezone", DEFAULT_TIMEZONE)
+            needed_start = range_start(range_param, pd.Timestamp.now(tz=timezone))
+            try:
+                meta, stored = self._refresh(stock, stock_symbol, range_param, interval, meta, stored, needed_start)
+            except Exception:
+                if stored is None:
+                    raise
+
+        if stored is None or stored.shape[1] == 0:
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], tz=timezone))
+
+        timestamps = stored[0]
+        start = slice_start(timestamps, range_param, meta["timezone"], needed_start)
+
+        index = pd.to_datetime(np.array(timestamps[start:], dtype=np.int64), unit="s", utc=True).tz_convert(meta["timezone"])
+        return pd.DataFrame({column: np.array(stored[row + 1, start:]) for row, column in enumerate(COLUMNS)}, index=index)
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+from httpClient import http_get
+from metrics import span, record_response
+
+THROTTLE_STATUS_CODES = (429, 503)
+MAX_BACKOFF = 300
+
+# Requests per second and burst size per upstream domain; unknown hosts are not limited.
+DEFAULT_RATE_LIMITS = {
+    "macrotrends.net": (0.2, 2),
+    "yahoo.com": (2.0, 5),
+    "ycharts.com": (0.5, 1),
+}
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0
+        self.strikes = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate is None:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, retry_after=None):
+        with self.lock:
+            self.strikes += 1
+            if retry_after is None:
+                retry_after = min(MAX_BACKOFF, 2 ** self.strikes) * random.uniform(1, 1.5)
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.tokens = 0
+            self.updated_at = now
+            return retry_after
+
+    def record_success(self):
+        with self.lock:
+            self.strikes = 0
+
+_rate_limits = dict(DEFAULT_RATE_LIMITS)
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def get_domain(url_or_host):
+    host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+    host = (host or "").lower()
+    for domain in _rate_limits:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host
+
+def configure_rate_limit(domain, rate, capacity=1):
+    with _buckets_lock:
+        _rate_limits[domain] = (rate, capacity)
+        _buckets.pop(domain, None)
+
+def get_rate_limiter(url_or_host):
+    domain = get_domain(url_or_host)
+    with _buckets_lock:
+        if domain not in _buckets:
+            rate, capacity = _rate_limits.get(domain, (None, 1))
+            _buckets[domain] = TokenBucket(rate, capacity)
+        return _buckets[domain]
+
+def parse_retry_after(response):
+    try:
+        return min(MAX_BACKOFF, float(response.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+def rate_limited_get(url, max_retries=3, **kwargs):
+    domain = get_domain(url)
+    bucket = get_rate_limiter(domain)
+    for attempt in range(max_retries + 1):
+        with span("throttle", host=domain):
+            bucket.acquire()
+        with span("fetch", host=domain):
+            response = http_get(url, **kwargs)
+        record_response(domain, response.status_code, len(response.content))
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            bucket.record_success()
+            return response
+        if attempt == max_retries:
+            return response
+        bucket.backoff(parse_retry_after(response))
+    return response
+
+def is_throttle_error(error):
+    return type(error).__name__ == "YFRateLimitError" or "Too Many Requests" in str(error)
+
+def call_rate_limited(url_or_host, fn, max_retries=3):
+    domain = get_domain(url_or_host)
+    bucket = get_rate_limiter(domain)
+    for attempt in range(max_retries + 1):
+        with span("throttle", host=domain):
+            bucket.acquire()
+        try:
+            with span("fetch", host=domain):
+                result = fn()
+        except Exception as e:
+            if not is_throttle_error(e) or attempt == max_retries:
+                raise
+            bucket.backoff()
+            continue
+        bucket.record_success()
+        return result
@@ -0,0 +1,209 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from cacheDir import CACHE_DIR
+from rateLimiter import rate_limited_get
+from metrics import record_cache
+from fileLock import file_lock
+
+DEFAULT_TTL = int(os.getenv("HTTP_CACHE_TTL", 24 * 60 * 60))
+DEFAULT_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+ACCESS_FLUSH_INTERVAL = 60
+CACHE_FILE_EXTENSIONS = ("body", "json")
+
+class ResponseCache:
+    # Persistent per-URL cache of response bodies and their parsed results, evicted least-recently-used
+    # once the stored bodies exceed max_bytes. Every change to the index is a read-modify-write under a
+    # file lock, because the batch scripts run several processes against the same directory.
+    def __init__(self, cache_dir=os.path.join(CACHE_DIR, "http"), max_bytes=DEFAULT_MAX_BYTES, access_flush_interval=ACCESS_FLUSH_INTERVAL):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.lock_file = os.path.join(cache_dir, "index.lock")
+        self.max_bytes = max_bytes
+        self.access_flush_interval = access_flush_interval
+        self.index = {}
+        self.index_mtime = None
+        # Hits only bump access times, which are kept here and flushed with the next write or every interval
+        self.pending_access = {}
+        self.flushed_at = time.time()
+        self.lock = threading.Lock()
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def _load_index(self):
+        try:
+            mtime = os.path.getmtime(self.index_file)
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+            self.index_mtime = mtime
+        except (OSError, ValueError):
+            self.index = {}
+            self.index_mtime = None
+
+    def _reload_index(self):
+        # Several worker processes may share the cache directory; pick up their writes
+        try:
+            mtime = os.path.getmtime(self.index_file)
+        except OSError:
+            return
+        if mtime != self.index_mtime:
+            self._load_index()
+
+    def _write_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_file, self.index_file)
+        self.index_mtime = os.path.getmtime(self.index_file)
+
+    @contextmanager
+    def _updating_index(self):
+        # Starts from the index on disk, so entries written by other processes are never dropped
+        with file_lock(self.lock_file):
+            self._load_index()
+            for key, last_access in self.pending_access.items():
+                if key in self.index:
+                    self.index[key]["lastAccess"] = max(self.index[key]["lastAccess"], last_access)
+            self.pending_access = {}
+            self.flushed_at = time.time()
+            yield
+            self._write_index()
+
+    def _read_file(self, path, binary=False):
+        try:
+            with open(path, 'rb' if binary else 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_file(self, path, data, binary=False):
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb' if binary else 'w') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+
+    def _remove_files(self, key):
+        for extension in CACHE_FILE_EXTENSIONS:
+            try:
+                os.remove(self._path(key, extension))
+            except OSError:
+                pass
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["lastAccess"]):
+            if total <= self.max_bytes:
+                break
+            self._remove_files(key)
+            total -= entry["size"]
+            del self.index[key]
+
+    def _sweep(self):
+        # Bodies the index does not list (left by a crash, or by an older unlocked writer) are outside the
+        # LRU accounting, so they would slowly push the directory past max_bytes
+        for name in os.listdir(self.cache_dir):
+            key, _, extension = name.partition(".")
+            if extension in CACHE_FILE_EXTENSIONS and len(key) == 64 and key not in self.index:
+                self._remove_files(key)
+
+    def lookup(self, url):
+        with self.lock:
+            self._reload_index()
+            key = self._key(url)
+            entry = self.index.get(key)
+            if not entry:
+                return None
+            self.pending_access[key] = time.time()
+            if time.time() - self.flushed_at >= self.access_flush_interval:
+                with self._updating_index():
+                    pass
+            return dict(entry, key=key)
+
+    def flush(self):
+        with self.lock:
+            if self.pending_access:
+                with self._updating_index():
+                    pass
+
+    def read_parsed(self, entry):
+        parsed = self._read_file(self._path(entry["key"], "json"))
+        return json.loads(parsed) if parsed is not None else None
+
+    def read_body(self, entry):
+        return self._read_file(self._path(entry["key"], "body"), binary=True)
+
+    def store(self, url, body, etag, last_modified, parsed):
+        with self.lock:
+            key = self._key(url)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with self._updating_index():
+                self._write_file(self._path(key, "body"), body, binary=True)
+                self._write_file(self._path(key, "json"), json.dumps(parsed))
+                now = time.time()
+                self.index[key] = {
+                    "url": url,
+                    "etag": etag,
+                    "lastModified": last_modified,
+                    "fetchedAt": now,
+                    "lastAccess": now,
+                    "size": len(body),
+                }
+                self._evict()
+                self._sweep()
+
+    def revalidated(self, url):
+        with self.lock:
+            with self._updating_index():
+                entry = self.index.get(self._key(url))
+                if entry:
+                    entry["fetchedAt"] = time.time()
+
+_response_cache = ResponseCache()
+atexit.register(_response_cache.flush)
+
+def cached_get(url, parse, headers=None, ttl=DEFAULT_TTL, cache=_response_cache):
+    entry = cache.lookup(url)
+    if entry and time.time() - entry["fetchedAt"] < ttl:
+        parsed = cache.read_parsed(entry)
+        if parsed is not None:
+            record_cache("http", True)
+            return parsed
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            request_headers["If-Modified-Since"] = entry["lastModified"]
+
+    response = rate_limited_get(url, headers=request_headers)
+
+    if response.status_code == 304 and entry:
+        parsed = cache.read_parsed(entry)
+        if parsed is None:
+            body = cache.read_body(entry)
+            parsed = parse(body) if body is not None else None
+        if parsed is not None:
+            # A 304 still costs a round trip but no body, so it counts as a hit
+            record_cache("http", True)
+            cache.revalidated(url)
+            return parsed
+        response = rate_limited_get(url, headers=headers)
+
+    record_cache("http", False)
+    if response.status_code != 200:
+        return {"error": f"Failed to retrieve the webpage. Status code: {response.status_code}"}
+
+    parsed = parse(response.content)
+    if "error" not in parsed:
+        cache.store(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"), parsed)
+    return parsed
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+
+class RunJournal:
+    # Append-only JSON-lines record of finished symbols so an interrupted batch run can resume where it stopped.
+    def __init__(self, path, fresh=False):
+        self.path = path
+        self.completed = {}
+        self.failed = {}
+        # Fetched but not yet finished: a resumed run picks these up without fetching them again
+        self.loaded = {}
+        self.lock = threading.Lock()
+
+        if fresh and os.path.exists(path):
+            os.remove(path)
+        self._load()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short if the previous run was killed mid-write
+                    continue
+                symbol = entry.get("symbol")
+                if entry.get("status") == "done":
+                    self.completed[symbol] = entry.get("result")
+                    self.failed.pop(symbol, None)
+                    self.loaded.pop(symbol, None)
+                elif entry.get("status") == "loaded":
+                    self.loaded[symbol] = entry.get("inputs")
+                    self.failed.pop(symbol, None)
+                else:
+                    self.failed[symbol] = entry.get("error")
+
+    def _append(self, entry):
+        entry["at"] = time.time()
+        with self.lock:
+            self.file.write(json.dumps(entry, default=str) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def is_done(self, symbol):
+        return symbol in self.completed
+
+    def record_loaded(self, symbol, inputs):
+        self._append({"symbol": symbol, "status": "loaded", "inputs": inputs})
+        with self.lock:
+            self.loaded[symbol] = inputs
+            self.failed.pop(symbol, None)
+
+    def record_success(self, symbol, result):
+        self._append({"symbol": symbol, "status": "done", "result": result})
+        with self.lock:
+            self.completed[symbol] = result
+            self.failed.pop(symbol, None)
+            self.loaded.pop(symbol, None)
+
+    def record_failure(self, symbol, error):
+        self._append({"symbol": symbol, "status": "failed", "error": str(error)})
+        with self.lock:
+            self.failed[symbol] = str(error)
+
+    def results(self, symbols):
+        return [self.completed[symbol] for symbol in symbols if self.completed.get(symbol) is not None]
+
+    def close(self, remove=False):
+        self.file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,8 +1,40 @@
-import yfinance as yf
 import sys
 import json
+from symbolSearch import build_search_index, load_learned_names, save_learned_names, is_ticker, NAME_PREFIX, FUZZY
 
-def search_stock(query):
+# Built once per process, so a worker answers every later query from memory
+_search_index = build_search_index()
+
+def search_stock(query, limit=5):
+    hits = _search_index.search_scored(query, limit=limit)
+    # An exact ticker or a ticker or name prefix is answered locally; anything weaker may be a symbol outside
+    # the index, so ask Yahoo and list its results after the local word matches
+    if hits and hits[0][0] >= NAME_PREFIX:
+        return [result for _, result in hits]
+
+    local_results = [result for score, result in hits if score > FUZZY]
+    try:
+        remote_results = learn(search_remote(query))
+    except Exception as e:
+        print(f"Remote search failed: {e}", file=sys.stderr)
+        remote_results = []
+
+    known = {result["ticker"] for result in local_results}
+    merged = local_results + [result for result in remote_results if result["ticker"] not in known]
+    # Typo matches are only a fallback when nothing else matched
+    return merged[:limit] if merged else [result for score, result in hits if score == FUZZY]
+
+def learn(stock_data):
+    if stock_data:
+        learned_names = load_learned_names()
+        for stock_info in stock_data:
+            _search_index.add(stock_info["ticker"], stock_info["name"])
+            learned_names[stock_info["ticker"]] = stock_info["name"]
+        save_learned_names(learned_names)
+    return stock_data
+
+def search_remote(query):
+    import yfinance as yf
     search_results = yf.Search(query)  
     quotes = search_results.quotes      
 
@@ -11,7 +43,7 @@ def search_stock(query):
         ticker = quote.get("symbol", "N/A")
         name = quote.get("shortname", "N/A")
         
-        if ticker.isalpha() and name != "N/A":
+        if is_ticker(ticker) and name != "N/A":
             stock_info = {
                 "ticker": ticker,
                 "name": name,
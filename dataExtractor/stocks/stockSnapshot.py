@@ -0,0 +1,38 @@
+from functools import cached_property
+from rateLimiter import call_rate_limited
+
+class StockSnapshot:
+    # Each Ticker attribute below is a separate Yahoo round trip; fetch each one at most once per symbol.
+    def __init__(self, stock_symbol):
+        # Imported here so modules that only pass snapshots around start without pandas
+        import yfinance as yf
+        self.symbol = stock_symbol
+        self.ticker = yf.Ticker(stock_symbol)
+
+    def _fetch(self, attribute):
+        return call_rate_limited("yahoo.com", lambda: getattr(self.ticker, attribute))
+
+    @cached_property
+    def info(self):
+        return self._fetch("info")
+
+    @cached_property
+    def cashflow(self):
+        return self._fetch("cashflow")
+
+    @cached_property
+    def financials(self):
+        return self._fetch("financials")
+
+    @cached_property
+    def dividends(self):
+        return self._fetch("dividends")
+
+    @cached_property
+    def growth_estimates(self):
+        return self._fetch("growth_estimates")
+
+def get_snapshot(stock):
+    if isinstance(stock, StockSnapshot):
+        return stock
+    return StockSnapshot(stock)
@@ -0,0 +1,149 @@
+import csv
+import json
+import os
+import re
+import threading
+from cacheDir import CACHE_DIR
+
+COMPANIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sp500', 'sp500_companies.csv')
+LEARNED_NAMES_FILE = os.path.join(CACHE_DIR, "searchNames.json")
+
+# Higher wins; ties go to the larger company
+EXACT_TICKER = 5
+TICKER_PREFIX = 4
+NAME_PREFIX = 3
+TOKEN_PREFIX = 2
+FUZZY = 1
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+def compact_ticker(ticker):
+    # Share classes are written BRK-B, BRK.B or BRKB depending on the source; index and match them without punctuation
+    return "".join(tokenize(ticker))
+
+def is_ticker(ticker):
+    return re.fullmatch(r"[A-Za-z]+([.-][A-Za-z]+)?", ticker) is not None
+
+def deletes(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))} | {word}
+
+class PrefixTrie:
+    # Every node keeps the ids of all entries below it, so a prefix lookup is one walk with no subtree traversal
+    def __init__(self):
+        self.root = {"ids": set()}
+
+    def add(self, word, entry_id):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {"ids": set()})
+            node["ids"].add(entry_id)
+
+    def find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node["ids"]
+
+class SymbolSearchIndex:
+    def __init__(self):
+        self.entries = []
+        self.by_ticker = {}
+        self.by_compact_ticker = {}
+        self.tickers = PrefixTrie()
+        self.names = PrefixTrie()
+        self.tokens = PrefixTrie()
+        self.fuzzy = {}
+        self.lock = threading.Lock()
+
+    def add(self, ticker, name, aliases=(), weight=0):
+        with self.lock:
+            if ticker in self.by_ticker:
+                return
+            entry_id = len(self.entries)
+            self.entries.append({"ticker": ticker, "name": name, "weight": weight})
+            self.by_ticker[ticker] = entry_id
+
+            lowered = compact_ticker(ticker)
+            self.by_compact_ticker.setdefault(lowered, entry_id)
+            self.tickers.add(lowered, entry_id)
+            for variant in deletes(lowered):
+                self.fuzzy.setdefault(variant, set()).add(entry_id)
+            for text in (name, *aliases):
+                self.names.add(" ".join(tokenize(text)), entry_id)
+                for token in tokenize(text):
+                    self.tokens.add(token, entry_id)
+                    if len(token) >= 4:
+                        for variant in deletes(token):
+                            self.fuzzy.setdefault(variant, set()).add(entry_id)
+
+    def search(self, query, limit=5):
+        return [result for _, result in self.search_scored(query, limit)]
+
+    def search_scored(self, query, limit=5):
+        # (score, result) pairs, best first; fuzzy matches only appear when nothing matched exactly or by prefix
+        lowered = query.strip().lower()
+        query_tokens = tokenize(lowered)
+        if not query_tokens:
+            return []
+
+        scores = {}
+        def score(ids, value):
+            for entry_id in ids:
+                if scores.get(entry_id, 0) < value:
+                    scores[entry_id] = value
+
+        compact = "".join(query_tokens)
+        score(self.tickers.find(compact), TICKER_PREFIX)
+        if compact in self.by_compact_ticker:
+            score([self.by_compact_ticker[compact]], EXACT_TICKER)
+        score(self.names.find(" ".join(query_tokens)), NAME_PREFIX)
+
+        # Every query word has to start some word of the name, in any order
+        token_hits = [self.tokens.find(token) for token in query_tokens]
+        score(set.intersection(*token_hits) if all(token_hits) else set(), TOKEN_PREFIX)
+
+        if not scores and len(compact) >= 3:
+            # Symmetric-delete lookup: one typo in a ticker or a name word of four letters or more
+            fuzzy_ids = set()
+            for variant in deletes(compact):
+                fuzzy_ids |= self.fuzzy.get(variant, set())
+            score(fuzzy_ids, FUZZY)
+
+        ranked = sorted(scores, key=lambda entry_id: (-scores[entry_id], -self.entries[entry_id]["weight"], self.entries[entry_id]["ticker"]))
+        return [(scores[entry_id], {"ticker": self.entries[entry_id]["ticker"], "name": self.entries[entry_id]["name"]}) for entry_id in ranked[:limit]]
+
+def load_learned_names(path=LEARNED_NAMES_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_learned_names(names, path=LEARNED_NAMES_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(names, f)
+    os.replace(tmp_file, path)
+
+def build_search_index(companies_file=COMPANIES_FILE, learned_names_file=LEARNED_NAMES_FILE):
+    index = SymbolSearchIndex()
+    if os.path.exists(companies_file):
+        with open(companies_file, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                ticker = row["Symbol"]
+                if not is_ticker(ticker) or not row.get("Shortname"):
+                    continue
+                try:
+                    weight = float(row.get("Marketcap") or 0)
+                except ValueError:
+                    weight = 0
+                index.add(ticker, row["Shortname"], aliases=[row.get("Longname") or ""], weight=weight)
+
+    # Symbols outside the index that remote searches have already resolved
+    for ticker, name in load_learned_names(learned_names_file).items():
+        index.add(ticker, name)
+    return index
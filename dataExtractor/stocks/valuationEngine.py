@@ -0,0 +1,132 @@
+import numpy as np
+
+TAX_RATE = 0.21
+DEFAULT_COST_OF_DEBT = 0.03
+DEFAULT_WACC = 0.08
+PROJECTION_YEARS = np.arange(1, 6)
+
+def to_array(values):
+    # Missing inputs become NaN so a symbol the scalar formulas would fail on comes out NaN instead
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+def build_input_arrays(inputs_list):
+    # inputs_list holds the {"dcf", "ddm", "graham"} dicts from ValuationInputStore, one per symbol
+    arrays = {}
+    for model in ("dcf", "ddm", "graham"):
+        for field in inputs_list[0].get(model, {}) if inputs_list else []:
+            arrays[f"{model}_{field}"] = to_array([inputs[model][field] for inputs in inputs_list])
+    return arrays
+
+def round_array(values, decimals=2):
+    return np.round(values, decimals)
+
+def get_cost_of_equity_array(beta, macro_inputs):
+    return macro_inputs["riskFreeRate"] + beta * (macro_inputs["expectedMarketReturn"] - macro_inputs["riskFreeRate"])
+
+def compute_wacc(arrays, macro_inputs):
+    market_cap = arrays["dcf_market_cap"]
+    total_debt = np.nan_to_num(arrays["dcf_total_debt"])
+    total_value = market_cap + total_debt
+    cost_of_equity = get_cost_of_equity_array(arrays["dcf_beta"], macro_inputs)
+
+    interest_expense = arrays["dcf_interest_expense"]
+    has_debt_cost = ~np.isnan(interest_expense) & (total_debt != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost_of_debt = np.where(has_debt_cost, interest_expense / total_debt * (1 - TAX_RATE), DEFAULT_COST_OF_DEBT)
+        wacc = np.where(total_value > 0, market_cap / total_value * cost_of_equity + total_debt / total_value * cost_of_debt, DEFAULT_WACC)
+    return np.where(np.isnan(market_cap) | np.isnan(cost_of_equity), np.nan, wacc)
+
+def compute_dcf_from_rates(free_cashflow, growth_rate, wacc, total_debt, total_cash, shares_outstanding):
+    # Any shape that broadcasts works: per-symbol vectors here, WACC x growth grids for sensitivity runs
+    free_cashflow, growth_rate, wacc = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (free_cashflow, growth_rate, wacc)))
+    growth_rate = np.where(growth_rate >= wacc, wacc - 0.01, growth_rate)
+    growth_factor = (1 + growth_rate)[..., np.newaxis] ** PROJECTION_YEARS
+    discount_factor = (1 + wacc)[..., np.newaxis] ** PROJECTION_YEARS
+    total_pv = np.sum(free_cashflow[..., np.newaxis] * growth_factor / discount_factor, axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = free_cashflow * (1 + growth_rate) ** 6 / (wacc - growth_rate)
+        discounted_terminal_value = terminal_value / (1 + wacc) ** 5
+        enterprise_value = total_pv + discounted_terminal_value
+        net_debt = total_debt - total_cash
+        has_shares = ~np.isnan(shares_outstanding) & (shares_outstanding != 0)
+        intrinsic_value = np.where(has_shares, (enterprise_value - net_debt) / shares_outstanding, np.nan)
+    return intrinsic_value
+
+def compute_dcf_values(arrays, macro_inputs):
+    wacc = compute_wacc(arrays, macro_inputs)
+    intrinsic_value = compute_dcf_from_rates(
+        arrays["dcf_free_cashflow"],
+        arrays["dcf_growth_rate"],
+        wacc,
+        np.nan_to_num(arrays["dcf_total_debt"]),
+        np.nan_to_num(arrays["dcf_total_cash"]),
+        arrays["dcf_shares_outstanding"],
+    )
+    return round_array(intrinsic_value)
+
+def compute_ddm_values(arrays, macro_inputs):
+    cost_of_equity = np.round(get_cost_of_equity_array(arrays["ddm_beta"], macro_inputs), 6)
+    growth_rate = arrays["ddm_growth_rate"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intrinsic_value = arrays["ddm_dividend"] * (1 + growth_rate) / (cost_of_equity - growth_rate)
+    return round_array(np.where(np.isfinite(intrinsic_value), intrinsic_value, np.nan))
+
+def compute_benjamin_graham_values(arrays, macro_inputs):
+    current_yield = macro_inputs["aaaCorporateBondYield"]
+    return round_array(arrays["graham_eps"] * (8.5 + 2 * arrays["graham_growth"]) * 4.4 / current_yield)
+
+def percent_difference(opening_price, value):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = round_array((opening_price - value) / value * 100)
+        percent_abs = round_array(np.abs(opening_price - value) / value * 100)
+    positive = value > 0
+    return np.where(positive, percent, np.nan), np.where(positive, percent_abs, np.nan)
+
+def value_universe(arrays, opening_prices, macro_inputs):
+    # Columnar results for every symbol at once; "valid" is False where a scalar run would have failed the symbol
+    opening_price = round_array(to_array(opening_prices))
+    dcf = compute_dcf_values(arrays, macro_inputs)
+    ddm = compute_ddm_values(arrays, macro_inputs)
+    graham = compute_benjamin_graham_values(arrays, macro_inputs)
+    average = round_array((dcf + ddm + graham) / 3)
+
+    values = np.stack([dcf, ddm, graham])
+    valid = np.isfinite(values).all(axis=0) & ~np.isnan(opening_price)
+    std_dev = round_array(np.std(values, axis=0, ddof=1))
+
+    results = {"valid": valid, "opening_price": opening_price, "dcf": dcf, "ddm": ddm, "graham": graham, "average": average, "std_dev": std_dev}
+    for name in ("dcf", "ddm", "graham", "average"):
+        results[f"percent_{name}"], results[f"percent_abs_{name}"] = percent_difference(opening_price, results[name])
+    return results
+
+def optional_float(value):
+    return None if np.isnan(value) else float(value)
+
+def valuation_documents(symbols, company_names, betas, results):
+    # Mongo documents in the shape sp500_intrinsicValues has always written, skipping invalid symbols
+    docs = []
+    for index, symbol in enumerate(symbols):
+        if not results["valid"][index]:
+            continue
+        beta = betas[index]
+        docs.append({
+            "Stock Symbol": symbol,
+            "Company Name": company_names[index],
+            "Opening Price": float(results["opening_price"][index]),
+            "Beta": round(float(beta), 2) if beta is not None else None,
+            "DCF Value": float(results["dcf"][index]),
+            "Percent DCF": optional_float(results["percent_dcf"][index]),
+            "Percent Abs DCF": optional_float(results["percent_abs_dcf"][index]),
+            "DDM Value": float(results["ddm"][index]),
+            "Percent DDM": optional_float(results["percent_ddm"][index]),
+            "Percent Abs DDM": optional_float(results["percent_abs_ddm"][index]),
+            "Benjamin Graham Value": float(results["graham"][index]),
+            "Percent Benjamin Graham": optional_float(results["percent_graham"][index]),
+            "Percent Abs Benjamin Graham": optional_float(results["percent_abs_graham"][index]),
+            "Average Value": float(results["average"][index]),
+            "Percent Average": optional_float(results["percent_average"][index]),
+            "Percent Abs Average": optional_float(results["percent_abs_average"][index]),
+            "Intrinsic Value Standard Deviation": float(results["std_dev"][index]),
+        })
+    return docs
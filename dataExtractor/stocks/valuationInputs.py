@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import time
+from getDCFValue import get_dcf_inputs
+from getDDMValue import get_ddm_inputs
+from getBenjaminGrahamValue import get_benjamin_graham_inputs
+from cacheDir import CACHE_DIR
+from metrics import span, record_cache
+
+STORE_FILE = os.path.join(CACHE_DIR, "valuationInputs.json")
+
+# Fields in Ticker.info that move when a company reports or changes its dividend
+FINGERPRINT_FIELDS = [
+    "mostRecentQuarter",
+    "lastFiscalYearEnd",
+    "trailingEps",
+    "sharesOutstanding",
+    "floatShares",
+    "totalDebt",
+    "totalCash",
+    "dividendRate",
+    "lastDividendValue",
+    "lastDividendDate",
+]
+
+# Analyst growth estimates drift without a new report, so stored inputs are refetched at least this often
+MAX_INPUT_AGE = 7 * 24 * 60 * 60
+
+def get_fingerprint(stock_info):
+    fundamentals = {field: stock_info.get(field) for field in FINGERPRINT_FIELDS}
+    return hashlib.sha256(json.dumps(fundamentals, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def refresh_market_inputs(inputs, stock_info):
+    inputs["dcf"]["market_cap"] = stock_info.get("marketCap", None)
+    inputs["dcf"]["beta"] = stock_info.get("beta", 0)
+    inputs["ddm"]["beta"] = stock_info.get("beta", 0)
+    return inputs
+
+class ValuationInputStore:
+    def __init__(self, path=STORE_FILE, max_age=MAX_INPUT_AGE):
+        self.path = path
+        self.max_age = max_age
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.records = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+
+    def get_inputs(self, stock):
+        # Returns the DCF/DDM/Graham inputs for a snapshot and whether the stored fundamentals were reused.
+        stock_info = stock.info
+        fingerprint = get_fingerprint(stock_info)
+        record = self.records.get(stock.symbol)
+
+        if record and record["fingerprint"] == fingerprint and time.time() - record["fetchedAt"] < self.max_age:
+            record_cache("valuationInputs", True)
+            return refresh_market_inputs(record["inputs"], stock_info), True
+
+        record_cache("valuationInputs", False)
+        with span("parse"):
+            inputs = {
+                "dcf": get_dcf_inputs(stock),
+                "ddm": get_ddm_inputs(stock),
+                "graham": get_benjamin_graham_inputs(stock),
+            }
+        self.records[stock.symbol] = {"fingerprint": fingerprint, "fetchedAt": time.time(), "inputs": inputs}
+        return inputs, False
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, default=str)
+        os.replace(tmp_file, self.path)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+STOCKS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'stocks'))
+SP500_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sp500'))
+
+sys.path.append(STOCKS_DIR)
+sys.path.append(SP500_DIR)
@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+
+from conftest import STOCKS_DIR
+
+# Runs the real warm-up and stdio loop with extra functions: one that never returns, one that prints to stdout
+# and one that reports whether a module is already imported
+WORKER = """
+import sys, time
+import extractorWorker
+
+def noisy(value):
+    print("debug output from an extractor")
+    return value
+
+extractorWorker.FUNCTIONS["hang"] = lambda: time.sleep(60)
+extractorWorker.FUNCTIONS["noisy"] = noisy
+extractorWorker.FUNCTIONS["loaded"] = lambda name: name in sys.modules
+extractorWorker.warm_up()
+extractorWorker.serve_stdio(float(sys.argv[1]))
+"""
+
+def start_worker(timeout):
+    worker = subprocess.Popen(
+        [sys.executable, "-c", WORKER, str(timeout)],
+        cwd=STOCKS_DIR,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert json.loads(worker.stdout.readline()) == {"ready": True}
+    return worker
+
+def send(worker, request):
+    worker.stdin.write(json.dumps(request) + "\n")
+    worker.stdin.flush()
+    return json.loads(worker.stdout.readline())
+
+def test_print_in_extractor_does_not_reach_protocol_stream():
+    worker = start_worker(5)
+    try:
+        assert send(worker, {"id": 1, "fn": "noisy", "args": ["a"]}) == {"id": 1, "result": "a"}
+        assert send(worker, {"id": 2, "fn": "noisy", "args": ["b"]}) == {"id": 2, "result": "b"}
+    finally:
+        worker.stdin.close()
+        worker.wait(timeout=10)
+    assert "debug output from an extractor" in worker.stderr.read()
+
+def test_heavy_dependencies_are_imported_before_ready():
+    worker = start_worker(5)
+    try:
+        assert send(worker, {"id": 1, "fn": "loaded", "args": ["yfinance"]}) == {"id": 1, "result": True}
+    finally:
+        worker.stdin.close()
+        worker.wait(timeout=10)
+        worker.stderr.close()
+
+def test_hung_call_answers_timeout_and_recycles_worker():
+    worker = start_worker(0.5)
+    try:
+        assert send(worker, {"id": 7, "fn": "hang"}) == {"id": 7, "error": "Request timed out: hang"}
+        # The worker must exit instead of serving more requests with a thread stuck in the pool
+        assert worker.wait(timeout=10) == 75
+    finally:
+        if worker.poll() is None:
+            worker.kill()
+        worker.stdin.close()
+        worker.stderr.close()
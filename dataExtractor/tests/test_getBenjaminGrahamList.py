@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import getBenjaminGrahamList
+
+DIVIDENDS = pd.Series([0.5, 0.6], index=pd.DatetimeIndex(["2023-05-01", "2024-05-01"], tz="America/New_York"))
+
+def stub_symbol(monkeypatch, info, eps, pe_ratios):
+    monkeypatch.setattr(getBenjaminGrahamList, "yf", SimpleNamespace(Ticker=lambda symbol: SimpleNamespace(info=info, dividends=DIVIDENDS)))
+    monkeypatch.setattr(getBenjaminGrahamList, "call_rate_limited", lambda host, fetch: fetch())
+    monkeypatch.setattr(getBenjaminGrahamList, "get_eps_data", lambda symbol: {"EPS_Data": [{"Year": 2020 + index, "EPS": value} for index, value in enumerate(eps)]})
+    monkeypatch.setattr(getBenjaminGrahamList, "get_pe_ratio_data", lambda symbol: {"PE_Ratio_Data": [{"Year": 2020 + index, "PE_Ratio": value} for index, value in enumerate(pe_ratios)]})
+
+@pytest.mark.parametrize("info, eps, pe_ratios", [
+    ({"totalRevenue": "N/A", "priceToBook": 1.5}, [1.0, 2.0], [10.0]),
+    ({"currentRatio": "2.1", "priceToBook": 1.5}, [1.0, 2.0], [10.0]),
+    ({"priceToBook": 1.5}, [1.0, None], [10.0]),
+    ({"priceToBook": 1.5}, ["1.2", 2.0], [10.0]),
+    ({"priceToBook": 1.5}, [1.0, 2.0], [None]),
+])
+def test_non_numeric_values_fail_the_symbol_while_loading(monkeypatch, info, eps, pe_ratios):
+    stub_symbol(monkeypatch, info, eps, pe_ratios)
+
+    with pytest.raises(TypeError):
+        getBenjaminGrahamList.load_graham_inputs("BAD")
+
+def test_missing_and_empty_values_fail_only_their_criteria(monkeypatch):
+    stub_symbol(monkeypatch, {"longName": "Good Co", "totalRevenue": "", "currentRatio": None, "priceToBook": 1.5}, [1.0, 2.0], [10.0])
+
+    inputs = getBenjaminGrahamList.load_graham_inputs("GOOD")
+
+    assert (inputs["total_revenue"], inputs["current_ratio"], inputs["eps"], inputs["pe_ratios"]) == (None, None, [1.0, 2.0], [10.0])
+    assert getBenjaminGrahamList.get_benjamin_graham_lists([inputs]) == [{
+        "Stock Symbol": "GOOD",
+        "Company Name": "Good Co",
+        "Defensive Value": 3,
+        "Defensive": "0011001",
+        "Enterprising Value": 5,
+        "Enterprising": "0011111",
+        "Overall Value": 8,
+    }]
+
+def test_bad_values_no_criterion_reads_leave_the_scores_unchanged(monkeypatch):
+    # The second-oldest EPS is outside the ten-year window and the oldest PE ratio outside the three-year average
+    eps = [1.0, 1.5] + [2.0] * 10
+    pe_ratios = [14.0, 13.0, 12.0, 11.0, 10.0]
+    stub_symbol(monkeypatch, {"longName": "Good Co", "priceToBook": 1.5}, eps, pe_ratios)
+    expected = getBenjaminGrahamList.get_benjamin_graham_lists([getBenjaminGrahamList.load_graham_inputs("GOOD")])
+
+    stub_symbol(monkeypatch, {"longName": "Good Co", "priceToBook": 1.5}, [1.0, "N/A"] + [2.0] * 10, [None, 13.0, 12.0, 11.0, 10.0])
+    inputs = getBenjaminGrahamList.load_graham_inputs("GOOD")
+
+    assert getBenjaminGrahamList.get_benjamin_graham_lists([inputs]) == expected
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from getHistoricalData import serialize_history
+
+def test_empty_history_serializes_to_no_bars():
+    # What yfinance returns for a range without bars: an object Index, not a DatetimeIndex
+    history = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"], index=pd.Index([]))
+
+    assert serialize_history(history) == []
+    assert serialize_history(history, 'columns') == {"date": [], "time": [], "price": []}
+
+def test_history_keeps_exchange_wall_clock_time():
+    index = pd.DatetimeIndex(["2024-03-01 09:30:00", "2024-03-01 09:35:00"]).tz_localize("America/New_York")
+    history = pd.DataFrame({"Close": [180.123, 180.456]}, index=index)
+
+    assert serialize_history(history) == [
+        {"date": "2024-03-01", "time": "09:30:00", "price": 180.12},
+        {"date": "2024-03-01", "time": "09:35:00", "price": 180.46},
+    ]
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import getTopStock
+from conftest import STOCKS_DIR
+
+# Runs the CLI with the scrape answered by a canned Yahoo page; argv[2] is the price it shows
+CLI = """
+import runpy, sys
+import rateLimiter
+
+class Response:
+    status_code = 200
+    content = (
+        '<div class="tableContainer yf-j24h8w"><table><tr><th></th></tr><tr>'
+        '<td><span class="symbol">AAPL</span></td><td><div>Apple Inc.</div></td>'
+        '<td><fin-streamer data-field="regularMarketPrice">' + sys.argv[2] + '</fin-streamer></td>'
+        '</tr></table></div>'
+    )
+
+rateLimiter.rate_limited_get = lambda url: Response()
+sys.argv = ["getTopStock.py", sys.argv[1]]
+runpy.run_path("getTopStock.py", run_name="__main__")
+"""
+
+def run_cli(cache_dir, category, price):
+    result = subprocess.run(
+        [sys.executable, "-c", CLI, category, price],
+        cwd=STOCKS_DIR,
+        env={**os.environ, "DATA_EXTRACTOR_CACHE_DIR": str(cache_dir), "TOP_STOCKS_STALE_AFTER": "1"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+def test_only_one_refresher_scrapes(tmp_path, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(getTopStock, "REFRESHER_LOCK_FILE", str(tmp_path / "refresher.lock"))
+    monkeypatch.setattr(getTopStock, "refresh_category", lambda category: refreshed.append(category))
+    monkeypatch.setattr(getTopStock, "_refresher", None)
+
+    # As if two pool workers started; flock also excludes a second open file in the same process
+    getTopStock.start_refresher(interval=3600)
+    getTopStock.start_refresher(interval=3600)
+    time.sleep(0.5)
+
+    assert sorted(refreshed) == sorted(getTopStock.CATEGORY_URLS)
+
+def test_background_refresh_does_not_keep_process_alive(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(getTopStock, "refresh_category", lambda category: release.wait(5))
+
+    getTopStock.refresh_in_background("gainers")
+    try:
+        threads = [thread for thread in threading.enumerate() if thread.name == "top-stocks-gainers"]
+        assert threads and all(thread.daemon for thread in threads)
+    finally:
+        release.set()
+
+def test_cli_refreshes_stale_snapshot_before_answering(tmp_path):
+    snapshot_dir = tmp_path / "topStocks"
+    snapshot_dir.mkdir()
+    stale = getTopStock.make_snapshot([{"Symbol": "AAPL", "Price": "100.00"}], time.time() - 3600)
+    (snapshot_dir / "gainers.json").write_text(json.dumps(stale))
+
+    first = run_cli(tmp_path, "gainers", "200.00")
+    assert first["data"][0]["Price"] == "200.00"
+    assert first["stale"] is False
+
+    # Stale again by the second run, which must not be left with the first run's scrape
+    time.sleep(1.1)
+    second = run_cli(tmp_path, "gainers", "300.00")
+    assert second["data"][0]["Price"] == "300.00"
+    assert second["stale"] is False
+    assert json.loads((snapshot_dir / "gainers.json").read_text())["data"][0]["Price"] == "300.00"
@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import getUserPortfStockData
+
+def fake_download(tickers, **kwargs):
+    # Like yf.download, columns come back keyed by the upper-case ticker
+    columns = pd.MultiIndex.from_product([[ticker.upper() for ticker in tickers], ["Close"]])
+    return pd.DataFrame(np.tile([[100.0], [110.0]], len(tickers)), columns=columns)
+
+def test_lowercase_symbols_are_quoted_under_the_callers_symbol(monkeypatch):
+    downloaded = []
+    monkeypatch.setattr(getUserPortfStockData.yf, "download", lambda tickers, **kwargs: downloaded.append(tickers) or fake_download(tickers))
+    monkeypatch.setattr(getUserPortfStockData, "_company_names", {"AAPL": "Apple Inc."})
+
+    quotes = getUserPortfStockData.get_stock_quotes(["aapl", "AAPL"])
+
+    assert downloaded == [["AAPL"]]
+    assert quotes["aapl"] == quotes["AAPL"] == {"companyName": "Apple Inc.", "currentPrice": 110.0, "change": "10.00", "change%": "10.00"}
+
+def test_bad_symbols_fail_on_their_own(monkeypatch):
+    monkeypatch.setattr(getUserPortfStockData.yf, "download", lambda tickers, **kwargs: fake_download(tickers))
+    monkeypatch.setattr(getUserPortfStockData, "_company_names", {"AAPL": "Apple Inc.", "MSFT": "Microsoft"})
+    event = {"Items": [{"portfolioName": "Mixed", "stock": [" aapl ", 42, ["MSFT"], {"s": 1}, "", "MSFT"]}]}
+
+    response = getUserPortfStockData.lambda_handler(event, None)
+
+    holdings = json.loads(response["body"])["Mixed"]
+    assert holdings[0]["Symbol"] == " aapl " and holdings[0]["Price"] == 110.0
+    assert [holding.get("error") for holding in holdings[1:5]] == [
+        "Invalid stock symbol: 42", "Invalid stock symbol: ['MSFT']", "Invalid stock symbol: {'s': 1}", "Invalid stock symbol: ''",
+    ]
+    assert holdings[5]["Symbol"] == "MSFT" and holdings[5]["Price"] == 110.0
+
+def test_ticker_missing_from_download_gets_its_own_error(monkeypatch):
+    monkeypatch.setattr(getUserPortfStockData.yf, "download", lambda tickers, **kwargs: fake_download([ticker for ticker in tickers if ticker != "GONE"]))
+    monkeypatch.setattr(getUserPortfStockData, "_company_names", {"AAPL": "Apple Inc.", "GONE": "Not found"})
+
+    quotes = getUserPortfStockData.get_stock_quotes(["AAPL", "gone"])
+
+    assert quotes["AAPL"]["currentPrice"] == 110.0
+    assert quotes["gone"] == {"error": "No price data found for gone"}
@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import checkImportTime
+
+# Loose enough for a busy test machine; heavy imports fail regardless of timing
+SCALE = 3.0
+
+def test_entry_points_stay_within_budget():
+    results = checkImportTime.check(list(checkImportTime.BUDGETS), runs=3, scale=SCALE)
+
+    assert [row for row in results if not row["ok"]] == []
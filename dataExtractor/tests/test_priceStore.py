@@ -0,0 +1,95 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from priceStore import PriceStore
+
+TIMEZONE = "America/New_York"
+
+def intraday_history(days, bars_per_day=3):
+    sessions = pd.bdate_range(end=pd.Timestamp.now(tz=TIMEZONE).normalize(), periods=days)
+    index = pd.DatetimeIndex([session + pd.Timedelta(hours=10, minutes=5 * bar) for session in sessions for bar in range(bars_per_day)])
+    close = np.arange(len(index), dtype=float)
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": close}, index=index)
+
+class FakeTicker:
+    def __init__(self, history):
+        self.history_frame = history
+        self.calls = 0
+
+    def history(self, start=None, **kwargs):
+        self.calls += 1
+        if start is not None:
+            return self.history_frame[self.history_frame.index >= start]
+        return self.history_frame
+
+def test_meta_that_does_not_match_data_is_discarded(tmp_path):
+    store = PriceStore(str(tmp_path), min_refresh=3600)
+    ticker = FakeTicker(intraday_history(3))
+    store.get_history(ticker, "AAPL", "5d", "60m")
+    meta, stored = store.load("AAPL", "60m")
+    assert meta["rows"] == stored.shape[1] == 9
+
+    # As if the process died after replacing the data but before replacing the meta
+    data_path, meta_path = store._paths("AAPL", "60m")
+    np.save(data_path, np.array(stored[:, :4]))
+    assert store.load("AAPL", "60m") == (None, None)
+
+    store.get_history(ticker, "AAPL", "5d", "60m")
+    assert ticker.calls == 2
+
+def test_intraday_store_keeps_only_the_longest_served_range(tmp_path):
+    store = PriceStore(str(tmp_path), retention={"5m": "1d"})
+    history = store.get_history(FakeTicker(intraday_history(4)), "AAPL", "1d", "5m")
+
+    meta, stored = store.load("AAPL", "5m")
+    assert stored.shape[1] == 3
+    assert len(history) == 3
+    with open(store._paths("AAPL", "5m")[1], 'r', encoding='utf-8') as f:
+        assert json.load(f)["coverageStart"] == stored[0, 0]
+
+def test_new_bars_are_appended_to_the_stored_series(tmp_path):
+    store = PriceStore(str(tmp_path), min_refresh=0)
+    full = intraday_history(2)
+    ticker = FakeTicker(full.iloc[:-2])
+    store.get_history(ticker, "AAPL", "1mo", "90m")
+
+    ticker.history_frame = full
+    history = store.get_history(ticker, "AAPL", "1mo", "90m")
+
+    assert history["Close"].tolist() == full["Close"].tolist()
+
+def test_readjusted_series_replaces_the_stored_bars(tmp_path):
+    store = PriceStore(str(tmp_path), min_refresh=0)
+    ticker = FakeTicker(intraday_history(2))
+    store.get_history(ticker, "AAPL", "1mo", "90m")
+
+    # A 2-for-1 split: upstream halves every past close, including bars the store already holds
+    adjusted = intraday_history(3)
+    adjusted[["Open", "High", "Low", "Close"]] /= 2
+    ticker.history_frame = adjusted
+    history = store.get_history(ticker, "AAPL", "1mo", "90m")
+
+    assert history["Close"].tolist() == adjusted["Close"].tolist()
+
+def test_slow_fetch_only_blocks_its_own_series(tmp_path):
+    store = PriceStore(str(tmp_path))
+    release = threading.Event()
+
+    class SlowTicker(FakeTicker):
+        def history(self, **kwargs):
+            release.wait(5)
+            return super().history(**kwargs)
+
+    slow = threading.Thread(target=store.get_history, args=(SlowTicker(intraday_history(2)), "AAPL", "5d", "60m"))
+    slow.start()
+    try:
+        finished = threading.Thread(target=store.get_history, args=(FakeTicker(intraday_history(2)), "MSFT", "5d", "60m"))
+        finished.start()
+        finished.join(2)
+        assert not finished.is_alive()
+    finally:
+        release.set()
+        slow.join(5)
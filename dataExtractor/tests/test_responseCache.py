@@ -0,0 +1,54 @@
+import json
+import multiprocessing
+import os
+
+from responseCache import ResponseCache
+
+def store_many(cache_dir, prefix, count):
+    cache = ResponseCache(cache_dir, max_bytes=10 ** 9)
+    for index in range(count):
+        cache.store(f"https://example.com/{prefix}/{index}", b"x" * 10, None, None, {"index": index})
+
+def stored_keys(cache_dir):
+    return {name.split(".")[0] for name in os.listdir(cache_dir) if name.endswith(".body")}
+
+def test_hits_do_not_rewrite_index(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("https://example.com/a", b"body", None, None, {"a": 1})
+    mtime = os.path.getmtime(cache.index_file)
+    os.utime(cache.index_file, (mtime - 10, mtime - 10))
+
+    for _ in range(5):
+        assert cache.read_parsed(cache.lookup("https://example.com/a")) == {"a": 1}
+    assert os.path.getmtime(cache.index_file) == mtime - 10
+
+    cache.flush()
+    with open(cache.index_file, 'r', encoding='utf-8') as f:
+        entry = next(iter(json.load(f).values()))
+    assert entry["lastAccess"] > entry["fetchedAt"]
+
+def test_processes_sharing_a_directory_keep_each_others_entries(tmp_path):
+    workers = [multiprocessing.Process(target=store_many, args=(str(tmp_path), prefix, 20)) for prefix in "abcd"]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with open(os.path.join(tmp_path, "index.json"), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    assert len(index) == 80
+    assert stored_keys(str(tmp_path)) == set(index)
+
+def test_eviction_sweeps_bodies_missing_from_index(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=25)
+    orphan = "f" * 64
+    for extension in ("body", "json"):
+        with open(os.path.join(tmp_path, f"{orphan}.{extension}"), 'w') as f:
+            f.write("left behind")
+
+    for index in range(4):
+        cache.store(f"https://example.com/{index}", b"x" * 10, None, None, {"index": index})
+
+    assert len(cache.index) == 2
+    assert stored_keys(str(tmp_path)) == set(cache.index)
+    assert not os.path.exists(os.path.join(tmp_path, f"{orphan}.json"))
@@ -0,0 +1,14 @@
+from runJournal import RunJournal
+
+def test_loaded_symbols_survive_a_restart_until_done(tmp_path):
+    path = str(tmp_path / "run.journal.jsonl")
+    journal = RunJournal(path)
+    journal.record_loaded("AAA", {"symbol": "AAA", "eps": [1.0]})
+    journal.record_loaded("BBB", {"symbol": "BBB", "eps": None})
+    journal.record_success("BBB", {"Stock Symbol": "BBB"})
+    journal.close()
+
+    resumed = RunJournal(path)
+    assert resumed.loaded == {"AAA": {"symbol": "AAA", "eps": [1.0]}}
+    assert resumed.is_done("BBB") and not resumed.is_done("AAA")
+    resumed.close()
@@ -0,0 +1,34 @@
+import pytest
+
+import searchStock
+from symbolSearch import build_search_index
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    # A fresh index and learned-names file per test; remote answers are recorded instead of fetched
+    learned_names_file = str(tmp_path / "searchNames.json")
+    monkeypatch.setattr(searchStock, "_search_index", build_search_index(learned_names_file=learned_names_file))
+    monkeypatch.setattr(searchStock, "load_learned_names", lambda: {})
+    monkeypatch.setattr(searchStock, "save_learned_names", lambda names: None)
+    queries = []
+    answers = {"TSM": [{"ticker": "TSM", "name": "Taiwan Semiconductor Manufacturing Company Limited"}]}
+    monkeypatch.setattr(searchStock, "search_remote", lambda query: queries.append(query) or answers.get(query, []))
+    return queries
+
+def test_ticker_outside_the_index_is_searched_remotely(remote):
+    results = searchStock.search_stock("TSM")
+
+    assert remote == ["TSM"]
+    assert results[0] == {"ticker": "TSM", "name": "Taiwan Semiconductor Manufacturing Company Limited"}
+    # Learned, so the next search is answered locally
+    assert searchStock.search_stock("TSM")[0]["ticker"] == "TSM"
+    assert remote == ["TSM"]
+
+def test_typo_matches_are_the_fallback_when_remote_finds_nothing(remote):
+    assert [result["ticker"] for result in searchStock.search_stock("Aplpe")] == ["AAPL"]
+    assert remote == ["Aplpe"]
+
+@pytest.mark.parametrize("query", ["Berkshire", "BRK.B", "brk-b", "BRK"])
+def test_share_class_symbols_are_found_locally(remote, query):
+    assert searchStock.search_stock(query)[0]["ticker"] == "BRK-B"
+    assert remote == []
@@ -6,6 +6,7 @@ import fs from "fs";
 import path from 'path';
 import { MongoClient } from 'mongodb';
 import { createCacheUtils } from '../utils/cacheUtils';
+import { createPythonWorkerPool, PythonWorkerPool } from '../utils/pythonWorkerPool';
 
 type BenjaminGrahamData = {
   "Stock Symbol": string;
@@ -21,6 +22,30 @@ import Redis from 'ioredis';
 const redisClient = new Redis();
 const { getFromCache, setInCache, clearAllCache, deleteCacheByKey } = createCacheUtils(redisClient);
 
+const workerFunctions: Record<string, string> = {
+  '../dataExtractor/stocks/getStockData.py': 'get_stock_data',
+  '../dataExtractor/stocks/getStockProfile.py': 'get_stock_profile',
+  '../dataExtractor/stocks/getTopStock.py': 'get_top_stocks',
+  '../dataExtractor/stocks/getAnalysis.py': 'process_stock_analysis',
+  '../dataExtractor/stocks/getHistoricalData.py': 'get_historical_data',
+  '../dataExtractor/stocks/getEpsData.py': 'get_eps_data',
+  '../dataExtractor/stocks/getPeRatioData.py': 'get_pe_ratio_data',
+  '../dataExtractor/stocks/getAaaCorporateBondYield.py': 'get_aaa_corporate_bond_yield',
+  '../dataExtractor/stocks/searchStock.py': 'search_stock',
+  '../dataExtractor/stocks/getDCFValue.py': 'get_dcf_value',
+  '../dataExtractor/stocks/getDDMValue.py': 'get_ddm_value',
+  '../dataExtractor/stocks/getBenjaminGrahamValue.py': 'get_benjamin_graham_value'
+};
+
+const workerPoolSize = Number(process.env.PYTHON_WORKER_POOL_SIZE) || 0;
+const workerPool: PythonWorkerPool | null = workerPoolSize > 0
+  ? createPythonWorkerPool({
+      workerScript: '../dataExtractor/stocks/extractorWorker.py',
+      size: workerPoolSize,
+      timeoutMs: Number(process.env.PYTHON_WORKER_TIMEOUT_MS) || 30000
+    })
+  : null;
+
 export const getNumber = (value: string | number): number | null => {
   if (typeof value === 'number') return value;
   if (typeof value === 'string') {
@@ -36,7 +61,12 @@ const executePythonScript = async (
   res: Response, 
   cacheKey: string
 ): Promise<void> => {
-  
+  const workerFunction = workerFunctions[scriptPath];
+  if (workerPool && workerFunction) {
+    await executeWithWorkerPool(workerPool, workerFunction, args, res, cacheKey);
+    return;
+  }
+
   const pythonProcess = spawn('python3', [scriptPath, ...args]);
   
   pythonProcess.stdout.on('data', async (data) => {
@@ -64,6 +94,26 @@ const executePythonScript = async (
   });
 };
 
+const executeWithWorkerPool = async (
+  pool: PythonWorkerPool,
+  fn: string,
+  args: string[],
+  res: Response,
+  cacheKey: string
+): Promise<void> => {
+  try {
+    const result = await pool.call(fn, args);
+    if (!res.headersSent) {
+      if (cacheKey) {
+        await setInCache(cacheKey, result);
+      }
+      res.json(result);
+    }
+  } catch (error) {
+    handleError(res, 'Error executing Python script');
+  }
+};
+
 const handleError = (res: Response, message: string, statusCode: number = 500): void => {
   if (!res.headersSent) {
     res.status(statusCode).json({ error: message });
@@ -1,15 +1,38 @@
 import json
-import boto3
 import csv
 import io
+from array import array
 import os
-import openai
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 import math
 
-s3 = boto3.client('s3')
+try:
+    import redis
+except ImportError:
+    redis = None
 
-openai.api_key = os.environ.get('OPENAI_API_KEY')
+# boto3 and openai are imported on first use, so the module loads without either installed
+_s3 = None
+
+def get_s3():
+    global _s3
+    if _s3 is None:
+        import boto3
+        _s3 = boto3.client('s3')
+    return _s3
+
+def create_openai_client():
+    import openai
+    openai.api_key = os.environ.get('OPENAI_API_KEY')
+    return openai.OpenAI()
+
+GPT_MODEL = "gpt-4.1"
+RECOMMENDATION_CACHE_TTL = int(os.environ.get('RECOMMENDATION_CACHE_TTL', 24 * 60 * 60))
+RECOMMENDATION_CACHE_SIZE = int(os.environ.get('RECOMMENDATION_CACHE_SIZE', 256))
 
 def get_number(value):
     try:
@@ -17,52 +40,199 @@ def get_number(value):
     except (TypeError, ValueError):
         return None
 
-def sort_and_filter_data(formatted, sort_by):
-    config = {
-        'percent_graham': {
-            'field': 'Percent Benjamin Graham',
-            'return_fields': ['Stock Symbol', 'Company Name', 'Opening Price', 'Benjamin Graham Value', 'Percent Benjamin Graham'],
-            'filter': lambda item: -10 <= get_number(item.get('Percent Benjamin Graham')) <= 10 if get_number(item.get('Percent Benjamin Graham')) is not None else False
-        },
-        'stddev': {
-            'field': 'Intrinsic Value Standard Deviation',
-            'return_fields': ['Stock Symbol', 'Company Name', 'Opening Price', 'Intrinsic Value Standard Deviation']
-        }
-    }
-
-    sort_option = config.get(sort_by, None)
+def within_ten_percent(field):
+    return lambda item: -10 <= get_number(item.get(field)) <= 10 if get_number(item.get(field)) is not None else False
 
-    filtered = []
-    for item in formatted['data']:
-        if sort_option:
-            if item.get(sort_option['field']) is not None:
-                filtered_item = {field: item.get(field) for field in sort_option['return_fields']}
-                filtered.append(filtered_item)
-        else:
-            if any(v is not None for v in item.values()):
-                filtered.append(item)
-
-    if sort_option:
-        filtered.sort(key=lambda x: get_number(x.get(sort_option['field'])) or math.inf)
+# Only the two rankings the handler sends to the model as reference stocks; this function serves no sortable list
+RANKINGS = {
+    'percent_graham': {
+        'field': 'Percent Benjamin Graham',
+        'return_fields': ['Stock Symbol', 'Company Name', 'Opening Price', 'Benjamin Graham Value', 'Percent Benjamin Graham'],
+        'filter': within_ten_percent('Percent Benjamin Graham')
+    },
+    'stddev': {
+        'field': 'Intrinsic Value Standard Deviation',
+        'return_fields': ['Stock Symbol', 'Company Name', 'Opening Price', 'Intrinsic Value Standard Deviation']
+    }
+}
 
-    if sort_option and 'filter' in sort_option:
-        filtered = list(filter(sort_option['filter'], filtered))
+def ranking_key(value):
+    # Missing, unparseable and zero values sort last; NaN too, so the order is total
+    number = get_number(value)
+    return number if number and not math.isnan(number) else math.inf
 
-    top_10 = filtered[:10]
+class RankingIndex:
+    # Built once per dataset version: each ranking's field is parsed once into a typed column and presorted,
+    # so a ranking request only walks its permutation until it has k rows.
+    def __init__(self, rows, retrieved_at=None):
+        self.rows = rows
+        self.retrieved_at = retrieved_at
+        self.columns = {}
+        self.rankings = {}
+        for sort_by, option in RANKINGS.items():
+            field = option['field']
+            if field not in self.columns:
+                self.columns[field] = array('d', (ranking_key(row.get(field)) for row in rows))
+            column = self.columns[field]
+            candidates = [index for index, row in enumerate(rows) if row.get(field) is not None]
+            # sorted() is stable, so ties keep file order exactly as the list sort did
+            order = sorted(candidates, key=column.__getitem__)
+            if 'filter' in option:
+                order = [index for index in order if option['filter'](rows[index])]
+            self.rankings[sort_by] = order
 
-    return {
-        'data': top_10,
-        'totalItems': len(filtered),
-        'retrievedAt': formatted.get('retrievedAt', datetime.utcnow().isoformat())
-    }
+    def top(self, sort_by, k=10):
+        option = RANKINGS[sort_by]
+        order = self.rankings[sort_by]
+        return {
+            'data': [{field: self.rows[index].get(field) for field in option['return_fields']} for index in order[:k]],
+            'totalItems': len(order),
+            'retrievedAt': self.retrieved_at or datetime.utcnow().isoformat()
+        }
 
 def load_csv_from_s3(bucket, key):
-    response = s3.get_object(Bucket=bucket, Key=key)
+    response = get_s3().get_object(Bucket=bucket, Key=key)
     content = response['Body'].read().decode('utf-8')
     reader = csv.DictReader(io.StringIO(content))
-    return list(reader)
+    return list(reader), response.get('ETag')
+
+# Survives warm invocations of the same container; rebuilt only when the S3 object changes
+_valuations_cache = {}
+
+# head_object responses have no body, so a missing key comes back as a plain ClientError with code '404'
+MISSING_OBJECT_CODES = ('404', 'NoSuchKey')
+
+def load_valuations(bucket, key):
+    s3 = get_s3()
+    try:
+        etag = s3.head_object(Bucket=bucket, Key=key).get('ETag')
+    except s3.exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') in MISSING_OBJECT_CODES:
+            return None
+        raise
+    if etag is not None and _valuations_cache.get('etag') == etag:
+        return _valuations_cache
+
+    rows, etag = load_csv_from_s3(bucket, key)
+    ranking_index = RankingIndex(rows, datetime.utcnow().isoformat())
+    _valuations_cache.clear()
+    _valuations_cache.update({
+        'etag': etag,
+        'rows': rows,
+        'ranking_index': ranking_index,
+        'graham_top10': ranking_index.top('percent_graham')['data'],
+        'stddev_top10': ranking_index.top('stddev')['data'],
+    })
+    return _valuations_cache
+
+class MemoryRecommendationCache:
+    # Process-local LRU with a TTL; entries survive warm invocations of the same container
+    def __init__(self, max_entries=RECOMMENDATION_CACHE_SIZE, ttl=RECOMMENDATION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.time() >= expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class RedisRecommendationCache:
+    # Shared across containers; eviction beyond the TTL is left to the server's maxmemory-policy
+    def __init__(self, client, ttl=RECOMMENDATION_CACHE_TTL, prefix="recommendations:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
 
-def get_gpt_recommendations(reference_stocks, user_criteria):
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+def create_recommendation_cache():
+    url = os.environ.get('RECOMMENDATION_CACHE_URL')
+    if url and redis is not None:
+        return RedisRecommendationCache(redis.Redis.from_url(url))
+    return MemoryRecommendationCache()
+
+class SingleFlight:
+    # Concurrent calls with the same key wait for the first one instead of repeating the work
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event()}
+                self.calls[key] = call
+
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call["done"].set()
+
+recommendation_cache = create_recommendation_cache()
+recommendation_flight = SingleFlight()
+
+def normalize_criteria(user_criteria):
+    return {name: str(user_criteria.get(name, '')).strip().lower() for name in ('risk_level', 'sector', 'horizon')}
+
+def recommendation_cache_key(user_criteria, dataset_version):
+    key = json.dumps({"criteria": normalize_criteria(user_criteria), "dataset": dataset_version, "model": GPT_MODEL}, sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def get_cached_recommendations(reference_stocks, user_criteria, dataset_version, cache=None, client=None):
+    cache = cache or recommendation_cache
+    key = recommendation_cache_key(user_criteria, dataset_version)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        # A concurrent leader may have filled the cache while this call was queued
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        recommendations = get_gpt_recommendations(reference_stocks, user_criteria, client)
+        if not (isinstance(recommendations, dict) and 'error' in recommendations):
+            cache.set(key, recommendations)
+        return recommendations
+
+    return recommendation_flight.do(key, fetch)
+
+def get_gpt_recommendations(reference_stocks, user_criteria, client=None):
     prompt = f"""
 You are a stock recommendation engine. The user selected these criteria:
 - Risk Level: {user_criteria['risk_level']}
@@ -92,10 +262,10 @@ Your response should be in JSON array format like:
 Only include the recommendations, no extra explanation.
     """
 
-    client = openai.OpenAI()
+    client = client or create_openai_client()
 
     response = client.chat.completions.create(
-        model="gpt-4.1",
+        model=GPT_MODEL,
         temperature=0.2,
         messages=[{"role": "user", "content": prompt}]
     )
@@ -107,20 +277,23 @@ Only include the recommendations, no extra explanation.
     except json.JSONDecodeError:
         return {"error": "Failed to parse GPT response."}
 
+def csv_not_found():
+    return {
+        'statusCode': 404,
+        'body': json.dumps({'error': 'CSV file not found in S3.'})
+    }
+
 def lambda_handler(event, context):
     try:
         bucket = 'laba.portfolio.booster'
         key = 'sp_500/company_valuations.csv'
 
-        rows = load_csv_from_s3(bucket, key)
+        valuations = load_valuations(bucket, key)
+        if valuations is None:
+            return csv_not_found()
 
-        formatted_data = {
-            'data': rows,
-            'retrievedAt': datetime.utcnow().isoformat()
-        }
-        
-        graham_top10 = sort_and_filter_data(formatted_data, 'percent_graham')['data']
-        stddev_top10 = sort_and_filter_data(formatted_data, 'stddev')['data']
+        graham_top10 = valuations['graham_top10']
+        stddev_top10 = valuations['stddev_top10']
         print(f"graham_10: ", graham_top10)
         print(f"stddev_10: ", stddev_top10)
         
@@ -141,7 +314,7 @@ def lambda_handler(event, context):
         print(f"user_criteria: ", user_criteria)
 
         reference_stocks = graham_top10 + stddev_top10
-        recommendations = get_gpt_recommendations(reference_stocks, user_criteria)
+        recommendations = get_cached_recommendations(reference_stocks, user_criteria, valuations['etag'])
         print(f"recommendations: ", recommendations)
         return {
             'statusCode': 200,
@@ -152,12 +325,9 @@ def lambda_handler(event, context):
             }
         }
 
-    except s3.exceptions.NoSuchKey:
-        return {
-            'statusCode': 404,
-            'body': json.dumps({'error': 'CSV file not found in S3.'})
-        }
     except Exception as e:
+        if _s3 is not None and isinstance(e, _s3.exceptions.NoSuchKey):
+            return csv_not_found()
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
@@ -0,0 +1,173 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+LAMBDA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LABA-python-get-ai-recommendations.py')
+
+ROWS = [
+    {'Stock Symbol': 'AAA', 'Company Name': 'A Corp', 'Opening Price': '10', 'Benjamin Graham Value': '11', 'Percent Benjamin Graham': '-5', 'Intrinsic Value Standard Deviation': '3'},
+    {'Stock Symbol': 'BBB', 'Company Name': 'B Corp', 'Opening Price': '20', 'Benjamin Graham Value': '21', 'Percent Benjamin Graham': '2', 'Intrinsic Value Standard Deviation': '1'},
+    {'Stock Symbol': 'CCC', 'Company Name': 'C Corp', 'Opening Price': '30', 'Benjamin Graham Value': '90', 'Percent Benjamin Graham': '-60', 'Intrinsic Value Standard Deviation': ''},
+]
+
+RECOMMENDATIONS = [{"stock_symbol": "BBB", "company_name": "B Corp", "reasons": ["value", "sector", "horizon"]}]
+
+class FakeS3:
+    class exceptions:
+        class ClientError(Exception):
+            def __init__(self, code):
+                super().__init__(code)
+                self.response = {'Error': {'Code': code}}
+
+        class NoSuchKey(ClientError):
+            pass
+
+    def __init__(self, rows, etag='"v1"'):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        self.body = buffer.getvalue().encode('utf-8')
+        self.etag = etag
+        self.downloads = 0
+
+    def head_object(self, Bucket, Key):
+        return {'ETag': self.etag}
+
+    def get_object(self, Bucket, Key):
+        self.downloads += 1
+        return {'ETag': self.etag, 'Body': io.BytesIO(self.body)}
+
+class FakeOpenAI:
+    # Counts completions and can hold them until released, to line up concurrent callers
+    def __init__(self, release=None):
+        self.calls = 0
+        self.release = release
+        self.lock = threading.Lock()
+        self.chat = types.SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        message = types.SimpleNamespace(content=json.dumps(RECOMMENDATIONS))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+@pytest.fixture
+def recommendations(monkeypatch):
+    # Neither client library is needed to import the module
+    monkeypatch.setitem(sys.modules, 'boto3', None)
+    monkeypatch.setitem(sys.modules, 'openai', None)
+    monkeypatch.delenv('RECOMMENDATION_CACHE_URL', raising=False)
+    spec = importlib.util.spec_from_file_location('get_ai_recommendations', LAMBDA_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_repeated_criteria_are_served_from_cache(recommendations, monkeypatch):
+    s3, client = FakeS3(ROWS), FakeOpenAI()
+    monkeypatch.setattr(recommendations, '_s3', s3)
+    monkeypatch.setattr(recommendations, 'create_openai_client', lambda: client)
+
+    first = recommendations.lambda_handler({'body': json.dumps({'risk_level': 'Low', 'sector': 'Tech'})}, None)
+    second = recommendations.lambda_handler({'body': {'risk_level': ' low ', 'sector': 'tech'}}, None)
+
+    assert first['statusCode'] == second['statusCode'] == 200
+    assert first['body']['recommendations'] == second['body']['recommendations'] == RECOMMENDATIONS
+    assert client.calls == 1
+    assert s3.downloads == 1
+
+def test_new_dataset_version_is_not_served_stale_recommendations(recommendations, monkeypatch):
+    s3, client = FakeS3(ROWS), FakeOpenAI()
+    monkeypatch.setattr(recommendations, '_s3', s3)
+    monkeypatch.setattr(recommendations, 'create_openai_client', lambda: client)
+
+    recommendations.lambda_handler({}, None)
+    s3.etag = '"v2"'
+    recommendations.lambda_handler({}, None)
+
+    assert client.calls == 2
+    assert s3.downloads == 2
+
+def test_missing_csv_is_not_found(recommendations, monkeypatch):
+    s3 = FakeS3(ROWS)
+    def head_object(Bucket, Key):
+        raise s3.exceptions.ClientError('404')
+    s3.head_object = head_object
+    monkeypatch.setattr(recommendations, '_s3', s3)
+
+    response = recommendations.lambda_handler({}, None)
+
+    assert response['statusCode'] == 404
+    assert json.loads(response['body']) == {'error': 'CSV file not found in S3.'}
+
+def test_other_s3_errors_are_server_errors(recommendations, monkeypatch):
+    s3 = FakeS3(ROWS)
+    def head_object(Bucket, Key):
+        raise s3.exceptions.ClientError('403')
+    s3.head_object = head_object
+    monkeypatch.setattr(recommendations, '_s3', s3)
+
+    assert recommendations.lambda_handler({}, None)['statusCode'] == 500
+
+class CountingNoCache:
+    # Never hits, so only the single-flight gate can stop a repeated completion
+    def __init__(self):
+        self.lookups = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            self.lookups += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+def test_concurrent_identical_requests_share_one_completion(recommendations):
+    release = threading.Event()
+    client, cache = FakeOpenAI(release), CountingNoCache()
+    criteria = {'risk_level': 'low', 'sector': 'any', 'horizon': 'short-term'}
+    results = []
+
+    def request():
+        results.append(recommendations.get_cached_recommendations([], criteria, '"v1"', cache=cache, client=client))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every caller has missed the cache once and the leader a second time inside the flight
+    deadline = time.time() + 5
+    while cache.lookups < 9 and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert client.calls == 1
+    assert results == [RECOMMENDATIONS] * 8
+
+def test_unparseable_completion_is_not_cached(recommendations):
+    client = FakeOpenAI()
+    client.create = lambda **kwargs: types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content="not json"))])
+    criteria = {'risk_level': 'low', 'sector': 'any', 'horizon': 'short-term'}
+
+    assert recommendations.get_cached_recommendations([], criteria, '"v1"', client=client) == {"error": "Failed to parse GPT response."}
+    assert recommendations.recommendation_cache.get(recommendations.recommendation_cache_key(criteria, '"v1"')) is None
+
+def test_ranking_index_ranks_the_reference_stocks(recommendations):
+    index = recommendations.RankingIndex(ROWS)
+
+    assert set(index.rankings) == {'percent_graham', 'stddev'}
+    assert [row['Stock Symbol'] for row in index.top('percent_graham')['data']] == ['AAA', 'BBB']
+    assert [row['Stock Symbol'] for row in index.top('stddev')['data']] == ['BBB', 'AAA', 'CCC']
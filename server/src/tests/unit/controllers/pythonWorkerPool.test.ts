@@ -0,0 +1,144 @@
+import { EventEmitter } from 'events';
+import { PassThrough } from 'stream';
+import { spawn } from 'child_process';
+import { createPythonWorkerPool } from '../../../../src/utils/pythonWorkerPool';
+
+jest.mock('child_process');
+
+type MockWorkerProcess = EventEmitter & {
+  stdin: PassThrough;
+  stdout: PassThrough;
+  kill: jest.Mock;
+  requests: any[];
+};
+
+const createMockWorkerProcess = (): MockWorkerProcess => {
+  const workerProcess = new EventEmitter() as MockWorkerProcess;
+  workerProcess.stdin = new PassThrough();
+  workerProcess.stdout = new PassThrough();
+  workerProcess.requests = [];
+  workerProcess.kill = jest.fn(() => workerProcess.emit('exit', null));
+  workerProcess.stdin.on('data', (chunk) => {
+    chunk.toString().trim().split('\n').forEach((line: string) => workerProcess.requests.push(JSON.parse(line)));
+  });
+  return workerProcess;
+};
+
+const respond = (workerProcess: MockWorkerProcess, response: object) => {
+  workerProcess.stdout.write(JSON.stringify(response) + '\n');
+};
+
+const flush = () => new Promise((resolve) => setImmediate(resolve));
+
+describe('pythonWorkerPool', () => {
+  let workerProcesses: MockWorkerProcess[];
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    workerProcesses = [];
+    (spawn as jest.Mock).mockImplementation(() => {
+      const workerProcess = createMockWorkerProcess();
+      workerProcesses.push(workerProcess);
+      return workerProcess;
+    });
+  });
+
+  it('should pre-start the configured number of workers', () => {
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 3, timeoutMs: 10000 });
+
+    expect(spawn).toHaveBeenCalledTimes(3);
+    expect(spawn).toHaveBeenCalledWith('python3', ['worker.py', '--timeout', '10'], expect.anything());
+    pool.close();
+  });
+
+  it('should send newline-delimited JSON requests and resolve with the result', async () => {
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 1 });
+
+    const promise = pool.call('get_stock_data', ['AAPL']);
+    await flush();
+
+    const [workerProcess] = workerProcesses;
+    expect(workerProcess.requests).toEqual([{ id: 1, fn: 'get_stock_data', args: ['AAPL'] }]);
+
+    respond(workerProcess, { id: 1, result: { currentPrice: 150.25 } });
+    await expect(promise).resolves.toEqual({ currentPrice: 150.25 });
+    pool.close();
+  });
+
+  it('should serve many requests from the same worker', async () => {
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 1 });
+
+    const first = pool.call('get_eps_data', ['AAPL']);
+    const second = pool.call('get_eps_data', ['MSFT']);
+    await flush();
+
+    const [workerProcess] = workerProcesses;
+    respond(workerProcess, { id: 2, result: 'MSFT' });
+    respond(workerProcess, { id: 1, result: 'AAPL' });
+
+    await expect(first).resolves.toBe('AAPL');
+    await expect(second).resolves.toBe('MSFT');
+    expect(spawn).toHaveBeenCalledTimes(1);
+    pool.close();
+  });
+
+  it('should reject when the worker returns an error', async () => {
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 1 });
+
+    const promise = pool.call('unknown_fn');
+    await flush();
+    respond(workerProcesses[0], { id: 1, error: 'Unknown function: unknown_fn' });
+
+    await expect(promise).rejects.toThrow('Unknown function: unknown_fn');
+    pool.close();
+  });
+
+  it('should prefer workers that have reported ready', async () => {
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 2 });
+    respond(workerProcesses[1], { ready: true });
+    await flush();
+
+    const first = pool.call('get_eps_data', ['AAPL']);
+    const second = pool.call('get_eps_data', ['MSFT']);
+    await flush();
+
+    expect(workerProcesses[0].requests).toEqual([]);
+    expect(workerProcesses[1].requests.map((request) => request.id)).toEqual([1, 2]);
+
+    respond(workerProcesses[1], { id: 1, result: 'AAPL' });
+    respond(workerProcesses[1], { id: 2, result: 'MSFT' });
+    await expect(first).resolves.toBe('AAPL');
+    await expect(second).resolves.toBe('MSFT');
+    pool.close();
+  });
+
+  it('should reject in-flight requests and restart a crashed worker', async () => {
+    jest.useFakeTimers();
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 1, restartDelayMs: 100 });
+
+    const promise = pool.call('get_stock_data', ['AAPL']);
+    workerProcesses[0].emit('exit', 1);
+
+    await expect(promise).rejects.toThrow('Python worker exited with code 1');
+
+    jest.advanceTimersByTime(100);
+    expect(spawn).toHaveBeenCalledTimes(2);
+
+    pool.close();
+    jest.useRealTimers();
+  });
+
+  it('should kill a worker that does not answer in time', async () => {
+    jest.useFakeTimers();
+    const pool = createPythonWorkerPool({ workerScript: 'worker.py', size: 1, timeoutMs: 1000 });
+
+    const promise = pool.call('get_stock_data', ['AAPL']);
+    jest.advanceTimersByTime(6000);
+
+    await expect(promise).rejects.toThrow('Python worker timed out on get_stock_data');
+    expect(workerProcesses[0].kill).toHaveBeenCalled();
+
+    pool.close();
+    jest.useRealTimers();
+  });
+});
@@ -0,0 +1,154 @@
+import { spawn, ChildProcess } from 'child_process';
+import readline from 'readline';
+
+type PendingRequest = {
+  resolve: (value: any) => void;
+  reject: (reason: Error) => void;
+  timer: NodeJS.Timeout;
+};
+
+type PythonWorker = {
+  process: ChildProcess;
+  pending: Map<number, PendingRequest>;
+  alive: boolean;
+  // Set once the worker has imported its dependencies and printed {"ready": true}
+  ready: boolean;
+};
+
+export type PythonWorkerPoolOptions = {
+  workerScript: string;
+  size?: number;
+  timeoutMs?: number;
+  restartDelayMs?: number;
+};
+
+// The worker enforces the timeout itself; the pool only kills a worker that
+// fails to answer within this extra grace period (e.g. stuck in native code).
+const hardTimeoutGraceMs = 5000;
+
+export const createPythonWorkerPool = ({
+  workerScript,
+  size = 2,
+  timeoutMs = 30000,
+  restartDelayMs = 1000
+}: PythonWorkerPoolOptions) => {
+  const workers: PythonWorker[] = [];
+  let nextRequestId = 1;
+  let closed = false;
+
+  const rejectAll = (worker: PythonWorker, message: string) => {
+    worker.pending.forEach(({ reject, timer }) => {
+      clearTimeout(timer);
+      reject(new Error(message));
+    });
+    worker.pending.clear();
+  };
+
+  const startWorker = (index: number): PythonWorker => {
+    const workerProcess = spawn(
+      'python3',
+      [workerScript, '--timeout', String(timeoutMs / 1000)],
+      { stdio: ['pipe', 'pipe', 'inherit'] }
+    );
+    const worker: PythonWorker = { process: workerProcess, pending: new Map(), alive: true, ready: false };
+
+    readline.createInterface({ input: workerProcess.stdout! }).on('line', (line) => {
+      let response: { id?: number; result?: any; error?: string; ready?: boolean };
+      try {
+        response = JSON.parse(line);
+      } catch (error) {
+        return;
+      }
+
+      if (response.ready) {
+        worker.ready = true;
+        return;
+      }
+
+      const request = response.id !== undefined ? worker.pending.get(response.id) : undefined;
+      if (!request) {
+        return;
+      }
+
+      clearTimeout(request.timer);
+      worker.pending.delete(response.id!);
+      if (response.error !== undefined) {
+        request.reject(new Error(response.error));
+      } else {
+        request.resolve(response.result);
+      }
+    });
+
+    workerProcess.on('exit', (code) => {
+      worker.alive = false;
+      rejectAll(worker, `Python worker exited with code ${code}`);
+      if (!closed) {
+        setTimeout(() => {
+          if (!closed) {
+            workers[index] = startWorker(index);
+          }
+        }, restartDelayMs);
+      }
+    });
+
+    workerProcess.on('error', () => {
+      worker.alive = false;
+      rejectAll(worker, 'Failed to start Python worker');
+    });
+
+    // Writes racing a crashed worker fail with EPIPE; the exit handler rejects them.
+    workerProcess.stdin!.on('error', () => {});
+
+    return worker;
+  };
+
+  for (let i = 0; i < size; i++) {
+    workers.push(startWorker(i));
+  }
+
+  // A warming worker (just started or restarted) only gets requests when no ready worker is alive;
+  // it queues them on stdin until its imports finish.
+  const pickWorker = (): PythonWorker | undefined => {
+    const alive = workers.filter((worker) => worker.alive);
+    const ready = alive.filter((worker) => worker.ready);
+    return (ready.length ? ready : alive).reduce<PythonWorker | undefined>(
+      (best, worker) => (!best || worker.pending.size < best.pending.size ? worker : best),
+      undefined
+    );
+  };
+
+  return {
+    call(fn: string, args: string[] = []): Promise<any> {
+      if (closed) {
+        return Promise.reject(new Error('Python worker pool is closed'));
+      }
+
+      const worker = pickWorker();
+      if (!worker) {
+        return Promise.reject(new Error('No Python worker available'));
+      }
+      const id = nextRequestId++;
+
+      return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => {
+          worker.pending.delete(id);
+          reject(new Error(`Python worker timed out on ${fn}`));
+          worker.process.kill();
+        }, timeoutMs + hardTimeoutGraceMs);
+
+        worker.pending.set(id, { resolve, reject, timer });
+        worker.process.stdin!.write(JSON.stringify({ id, fn, args }) + '\n');
+      });
+    },
+
+    close(): void {
+      closed = true;
+      workers.forEach((worker) => {
+        rejectAll(worker, 'Python worker pool is closed');
+        worker.process.kill();
+      });
+    }
+  };
+};
+
+export type PythonWorkerPool = ReturnType<typeof createPythonWorkerPool>;